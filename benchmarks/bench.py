@@ -0,0 +1,244 @@
+#!/bin/env python3
+"""Headless benchmarks of scripted stress scenarios.
+
+Every scenario builds a reproducible world through the real `mk_*`
+launchers on top of a freshly set up wave, then times the frame of the
+`Game` state for a number of frames on the simulated clock, split into
+`run_game_systems` without the collisions, all `do_collisions` passes of
+the frame, and `draw`.  Nothing is spawned by the game itself while the
+benchmark runs, so all scenarios only contain what they created.
+
+    python benchmarks/bench.py --out results.json
+    python benchmarks/bench.py --baseline benchmarks/baseline.json
+
+With `--baseline`, the results are compared against a previous run.  A
+phase regressed if its median got slower than `--threshold` (relative) and
+`--min-delta` (absolute, to ignore noise on tiny numbers), or if it needs
+more render calls per frame than before.  The exit code is 1 if anything
+regressed.
+"""
+
+import json
+import platform
+import sys
+
+from argparse import ArgumentParser, Namespace
+from collections.abc import Callable
+from pathlib import Path
+from random import randint, seed, uniform
+from time import perf_counter
+
+import numpy as np
+import pygame
+import tinyecs as ecs
+
+from pygame.math import Vector2 as vec2
+
+import missilecommand.config as C
+
+from missilecommand.__main__ import init_headless
+from missilecommand.game import Game, StatePhase, Warp
+from missilecommand.headless import sim_clock
+from missilecommand.launchers import mk_explosion, mk_missile, mk_smartbomb
+from missilecommand.renderstats import KINDS, render_stats
+
+PHASES = ('run_game_systems', 'do_collisions', 'draw')
+
+
+def _no_shutdown(eid):
+    pass
+
+
+def _targets() -> list[vec2]:
+    return [*C.POS_CITIES, *C.POS_BATTERIES]
+
+
+def incoming_missiles(n: int) -> Callable[[Game], None]:
+    def build(game: Game) -> None:
+        targets = _targets()
+        for i in range(n):
+            start = vec2(randint(0, C.SCREEN.width), uniform(-3, C.SCREEN.height / 3))
+            mk_missile(start, vec2(targets[i % len(targets)]), game.wave.missile_speed,
+                       _no_shutdown, incoming=True)
+
+    return build
+
+
+def explosions(n: int) -> Callable[[Game], None]:
+    def build(game: Game) -> None:
+        area = C.CROSSHAIR_CONSTRAINT
+        for _ in range(n):
+            mk_explosion(vec2(uniform(area.left, area.right), uniform(area.top, area.bottom)))
+
+    return build
+
+
+def evading_smartbombs(n: int) -> Callable[[Game], None]:
+    """Smartbombs with an explosion right in their way, so they dodge."""
+    def build(game: Game) -> None:
+        targets = _targets()
+        for i in range(n):
+            start = vec2(C.SCREEN.width * (i + 1) / (n + 1), C.SCREEN.height / 4)
+            target = vec2(targets[i % len(targets)])
+            mk_smartbomb(start, target, game.wave.missile_speed, _no_shutdown)
+            mk_explosion(start + (target - start).normalize() * 1.25 * C.EXPLOSION_EVADE_RADIUS)
+
+    return build
+
+
+SCENARIOS = {
+    'missiles-8': incoming_missiles(8),
+    'missiles-64': incoming_missiles(64),
+    'missiles-512': incoming_missiles(512),
+    'missiles-2048': incoming_missiles(2048),
+    'explosions-50': explosions(50),
+    'smartbombs-3-evading': evading_smartbombs(3),
+}
+
+
+def run_scenario(app, build: Callable[[Game], None], frames: int, rng_seed: int, wave: int = 0) -> dict:
+    """Build a world on top of `wave` and time the game phases over `frames` frames."""
+    game = Game(app, warp=Warp(wave, briefing=False))
+    game.reset()
+    game.setup_wave()
+    game.phase = StatePhase.PLAYING
+
+    seed(rng_seed)
+    build(game)
+    entities = len(ecs.eidx)
+
+    # `run_game_systems` runs the collisions itself, and the gameplay phase
+    # runs them a second time afterwards.  Time every pass where it happens,
+    # so the collisions don't end up in the systems column.
+    collisions = [0.0]
+    do_collisions = game.do_collisions
+
+    def timed_collisions() -> None:
+        t0 = perf_counter()
+        do_collisions()
+        collisions[0] += perf_counter() - t0
+
+    game.do_collisions = timed_collisions
+
+    times = {phase: [] for phase in PHASES}
+    calls = []
+    for _ in range(frames):
+        sim_clock.advance(app.dt)
+        collisions[0] = 0.0
+
+        t0 = perf_counter()
+        game.run_game_systems(app.dt)
+        game.do_collisions()
+        t1 = perf_counter()
+        game.draw()
+        t2 = perf_counter()
+
+        times['run_game_systems'].append(t1 - t0 - collisions[0])
+        times['do_collisions'].append(collisions[0])
+        times['draw'].append(t2 - t1)
+        calls.append(tuple(render_stats.frame.values()))
+
+    res = {'entities': entities, 'entities_left': len(ecs.eidx)}
+    for phase, samples in times.items():
+        ms = np.array(samples) * 1000
+        p50, p95 = np.percentile(ms, (50, 95))
+        res[phase] = {'mean_ms': ms.mean(), 'p50_ms': p50, 'p95_ms': p95, 'max_ms': ms.max()}
+    res['render_calls'] = dict(zip(KINDS, np.array(calls).mean(axis=0)))
+
+    return res
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    """Return a line per regression of results against baseline."""
+    regressions = []
+    for name, scenario in results['scenarios'].items():
+        base = baseline['scenarios'].get(name)
+        if base is None:
+            continue
+
+        for phase in PHASES:
+            now, before = scenario[phase]['p50_ms'], base[phase]['p50_ms']
+            if now - before > min_delta and now > before * (1 + threshold):
+                regressions.append(f'{name} {phase}: p50 {before:.3f}ms -> {now:.3f}ms ({now / before - 1:+.0%})')
+
+        for kind, now in scenario['render_calls'].items():
+            before = base['render_calls'].get(kind, now)
+            if now > before:
+                regressions.append(f'{name} {kind}/frame: {before:.1f} -> {now:.1f}')
+
+    return regressions
+
+
+def report(results: dict) -> None:
+    print(f'{"scenario":24s} {"entities":>8s}', *(f'{phase + " p50/p95":>28s}' for phase in PHASES), f'{"draws":>6s}')
+    for name, res in results['scenarios'].items():
+        cols = (f'{res[phase]["p50_ms"]:12.3f} / {res[phase]["p95_ms"]:8.3f}ms' for phase in PHASES)
+        print(f'{name:24s} {res["entities"]:8d}', *cols, f'{res["render_calls"]["draws"]:6.1f}')
+
+
+def parse_args() -> Namespace:
+    parser = ArgumentParser(description='Headless benchmarks of scripted stress scenarios')
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f'Scenarios to run, all if none given ({", ".join(SCENARIOS)})')
+    parser.add_argument('--frames', type=int, default=2 * C.FPS,
+                        help='Number of frames to time per scenario')
+    parser.add_argument('--wave', type=int, default=0,
+                        help='Wave the scenarios are built on, sets e.g. the missile speed')
+    parser.add_argument('--motion-store', action='store_true',
+                        help='Move missiles and smartbombs with the vectorized motion store')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Random seed for building the scenarios')
+    parser.add_argument('--out', type=Path, default=None,
+                        help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', type=Path, default=None,
+                        help='Compare the results against this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Relative slowdown of the median counted as regression')
+    parser.add_argument('--min-delta', type=float, default=0.05,
+                        help='Absolute slowdown in ms below which a change is ignored')
+
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - SCENARIOS.keys()
+    if unknown:
+        parser.error(f'unknown scenario(s): {", ".join(sorted(unknown))}')
+
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    C.MOTION_STORE = args.motion_store
+
+    app = init_headless(1 / C.FPS)
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'frames': args.frames,
+            'seed': args.seed,
+            'wave': args.wave,
+            'motion_store': args.motion_store,
+        },
+        'scenarios': {name: run_scenario(app, SCENARIOS[name], args.frames, args.seed, args.wave)
+                      for name in args.scenarios or SCENARIOS},
+    }
+
+    report(results)
+
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=4))
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold, args.min_delta)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s) against {args.baseline}:')
+            print('\n'.join(f'    {line}' for line in regressions))
+            sys.exit(1)
+
+        print(f'\nNo regressions against {args.baseline}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,8 @@
 #!/bin/env python3
 
+import atexit
+
+from argparse import ArgumentParser, Namespace
 from os import environ
 from pathlib import Path
 from types import SimpleNamespace
@@ -13,13 +16,19 @@ from ddframework.statemachine import StateMachine
 
 import missilecommand.config as C
 
+from missilecommand.atlas import Atlas
 from missilecommand.debug_layer import DebugLayer
+from missilecommand.loadlog import load_log
+from missilecommand.maskcache import ScaledMaskCache
+from missilecommand.metrics import metrics
+from missilecommand.profiler import profiler
 from missilecommand.splash import Splash
 from missilecommand.title import Title
+from missilecommand.tracer import tracer
 from missilecommand.highscores import Highscores
 from missilecommand.highscoreentry import HighscoreEntry
 from missilecommand.instructions import Instructions
-from missilecommand.game import Game
+from missilecommand.game import Game, Warp
 from missilecommand.gameover import Gameover
 
 BANNER = 'Missile Command v0.0.5'
@@ -34,29 +43,156 @@ def load_sounds(assets: Path) -> None:
 
 
 def load_spritesheet(renderer: sdl2.Renderer, fname: str) -> None:
-    def ss2t(i: pygame.Surface, r: pygame.Rect) -> sdl2.Texture:
-        return sdl2.Texture.from_surface(renderer, i.subsurface(r))
-
     def ss2m(i: pygame.Surface, r: pygame.Rect) -> pygame.mask.Mask:
         return pygame.mask.from_surface(i.subsurface(r))
 
     spritesheet = pygame.image.load(fname)
     cache['textures']['spritesheet'] = sdl2.Texture.from_surface(renderer, spritesheet)
+    # All sprites are drawn from this one texture, see Atlas
+    atlas = Atlas(cache['textures']['spritesheet'])
 
     for k, v in C.SPRITESHEET.items():  # noqa: bad-assignment
         if isinstance(v, (list, tuple)):
-            images = [ss2t(spritesheet, rect) for rect in v]
+            images = [atlas.sprite(rect) for rect in v]
             masks = [ss2m(spritesheet, rect) for rect in v]
             cache['textures'][k] = images
             cache['masks'][k] = masks
         else:
-            cache['textures'][k] = ss2t(spritesheet, v)
+            cache['textures'][k] = atlas.sprite(v)
             cache['masks'][k] = ss2m(spritesheet, v)
 
 
+def load_scaled_masks() -> None:
+    """Precompute the scaled explosion masks for the flyer collisions."""
+    cache['scaled-masks']['explosions'] = ScaledMaskCache(cache['masks']['explosions'][0],
+                                                          *C.EXPLOSION_SCALE_RANGE,
+                                                          C.EXPLOSION_MASK_STEPS)
+
+
+def parse_args() -> Namespace:
+    parser = ArgumentParser(description=BANNER)
+    parser.add_argument('--headless', action='store_true',
+                        help='Simulate the game without window and audio as fast as possible')
+    parser.add_argument('--waves', type=int, default=len(C.WAVES),
+                        help='Number of waves to simulate in headless mode')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed for headless mode')
+    parser.add_argument('--dt', type=float, default=1 / C.FPS,
+                        help='Fixed timestep for headless mode')
+    parser.add_argument('--profile', action='store_true',
+                        help='Start with the per-system profiler enabled (toggle in game with F10)')
+    parser.add_argument('--profile-csv', default='profile.csv',
+                        help='File the profiler stats are written to on exit')
+    parser.add_argument('--trace', metavar='FILE', default=None,
+                        help='Write a Chrome/Perfetto trace of all frames to FILE')
+    parser.add_argument('--metrics', metavar='PORT', type=int, default=None,
+                        help='Serve live metrics on http://localhost:PORT/metrics')
+    parser.add_argument('--no-title-stats', action='store_true',
+                        help='Don\'t show fps and entity counts in the window title')
+    parser.add_argument('--wave', type=int, default=None,
+                        help='Start the game at this wave (index into the wave table, 0 is the first)')
+    parser.add_argument('--score-mult', type=int, default=None,
+                        help='Score multiplier of the first wave with --wave')
+    parser.add_argument('--cities', type=int, default=6, choices=range(7),
+                        help='Number of cities standing with --wave')
+    parser.add_argument('--bonus-cities', type=int, default=0,
+                        help='Number of bonus cities with --wave')
+    parser.add_argument('--no-briefing', action='store_true',
+                        help='Don\'t show the briefing before the waves with --wave')
+    parser.add_argument('--motion-store', action='store_true',
+                        help='Move missiles and smartbombs with the vectorized motion store')
+    parser.add_argument('--stress', action='store_true',
+                        help='Lift the arcade limits on incoming missiles, smartbombs and flyers')
+    parser.add_argument('--load-log', default='load.csv',
+                        help='File the frame cost over load is written to in stress mode')
+    parser.add_argument('--hud', action='store_true',
+                        help='Show the performance overlay, enables the profiler')
+    parser.add_argument('--grid', action='store_true',
+                        help='Show the layout grid')
+
+    args = parser.parse_args()
+    if args.wave is not None and args.wave < 0:
+        parser.error('--wave must not be negative')
+
+    return args
+
+
+def mk_warp(args: Namespace) -> Warp | None:
+    if args.wave is None:
+        return None
+
+    return Warp(args.wave, args.score_mult, args.cities, args.bonus_cities, not args.no_briefing)
+
+
+def init_headless(dt: float) -> 'HeadlessApp':
+    """Set up pygame and the assets for running without window and audio.
+
+    Also used by the benchmarks.
+    """
+    from missilecommand import headless
+
+    environ['SDL_VIDEODRIVER'] = 'dummy'
+    environ['SDL_AUDIODRIVER'] = 'dummy'
+    C.PLAY_AUDIO = False
+    # Nobody sees the title of the dummy window
+    C.WINDOW_TITLE_STATS = False
+
+    # The mixer was already opened on import of the soundpool
+    pygame.mixer.quit()
+    pygame.init()
+
+    headless.install_sim_clock()
+
+    app = headless.HeadlessApp(C.TITLE, C.SCREEN.size, dt)
+    tracer.install(app)
+    load_sounds(C.ASSETS)
+    load_spritesheet(app.renderer, C.ASSETS.joinpath('spritesheet.png'))
+    load_scaled_masks()
+
+    return app
+
+
+def main_headless(args: Namespace) -> None:
+    from missilecommand import headless
+
+    app = init_headless(args.dt)
+    stats = headless.run(app, Game(app, warp=mk_warp(args)), args.waves, args.seed)
+
+    print(f'waves={stats["waves"]}  ticks={stats["ticks"]}  sim_time={stats["sim_time"]:.1f}s  '
+          f'wall_time={stats["wall_time"]:.2f}s  tps={stats["tps"]:.1f}  score={stats["score"]}')
+    print(f'explosion mask cache: hits={stats["mask_cache_hits"]}  misses={stats["mask_cache_misses"]}')
+    print(f'entity pool: hits={stats["pool_hits"]}  misses={stats["pool_misses"]}  hit rate={stats["pool_hit_rate"]:.1%}')
+
+
 def main() -> None:
     print(BANNER)
 
+    args = parse_args()
+
+    profiler.enabled = args.profile
+    atexit.register(profiler.export_csv, args.profile_csv)
+
+    if args.trace:
+        tracer.start(args.trace)
+        atexit.register(tracer.stop)
+
+    if args.metrics is not None:
+        metrics.start(args.metrics)
+        atexit.register(metrics.stop)
+
+    C.WINDOW_TITLE_STATS = not args.no_title_stats
+    C.MOTION_STORE = args.motion_store
+
+    if args.stress:
+        for k, v in C.STRESS_PROFILE.items():
+            setattr(C, k, v)
+        load_log.start(args.load_log)
+        atexit.register(load_log.stop)
+
+    if args.headless:
+        main_headless(args)
+        return
+
     if 'XDG_SESSION_TYPE' in environ and environ['XDG_SESSION_TYPE'] == 'wayland':
         environ['SDL_VIDEODRIVER'] = 'wayland'
 
@@ -65,10 +201,12 @@ def main() -> None:
     # w = pygame.Window(size=C.WINDOW.size, position=pygame.WINDOWPOS_CENTERED)
     # app = App(C.TITLE, window=w, resolution=C.SCREEN.size, fps=C.FPS, bgcolor=C.COLOR.background)
     app = App(C.TITLE, resolution=C.SCREEN.size, fps=C.FPS, bgcolor=C.COLOR.background)
+    tracer.install(app)
     pygame.mouse.set_visible(False)
 
     load_sounds(C.ASSETS)
     load_spritesheet(app.renderer, C.ASSETS.joinpath('spritesheet.png'))
+    load_scaled_masks()
 
     states = SimpleNamespace(
         splash=Splash(app),
@@ -77,9 +215,11 @@ def main() -> None:
         highscores=Highscores(app),
         instructions=Instructions(app),
         highscoreentry=HighscoreEntry(app),
-        game=Game(app),
+        game=Game(app, warp=mk_warp(args)),
         gameover=Gameover(app),
     )
+    for state in vars(states).values():
+        tracer.instrument(state)
 
     sm = StateMachine()
     sm.add(states.splash, states.instructions)
@@ -92,7 +232,11 @@ def main() -> None:
     sm.add(states.highscoreentry, states.highscores)
     walker = sm.walker(states.splash)
 
-    # walker = DebugLayer(app, walker)
+    if args.hud or args.grid:
+        walker = DebugLayer(app, walker, grid=args.grid)
+    if args.hud:
+        profiler.enabled = True
+
     app.run(walker)
 
 
@@ -0,0 +1,100 @@
+import pygame
+import pygame._sdl2 as sdl2
+
+from pygame.typing import ColorLike, Point, RectLike
+
+from missilecommand.renderstats import render_stats
+
+
+class Atlas:
+    """A single texture holding many sprites.
+
+    All sprites of the atlas are drawn from the same texture using source
+    rects, so the renderer doesn't need to switch textures between them.
+    The alpha and color modulation of the texture is only touched when a
+    sprite needs a different value than the one drawn before, so runs of
+    sprites sharing the same values don't cause any state changes.
+    """
+
+    def __init__(self, texture: sdl2.Texture) -> None:
+        self.texture = texture
+        self.renderer = texture.renderer
+        self._alpha = texture.alpha
+        self._color = pygame.Color(texture.color)
+
+    def __repr__(self) -> str:
+        return f'Atlas({self.texture.width}x{self.texture.height})'
+
+    def sprite(self, rect: RectLike) -> 'Sprite':
+        """Create a sprite for the given region of the atlas."""
+        return Sprite(self, rect)
+
+    def draw(self, srcrect: pygame.Rect, dstrect: RectLike | None, alpha: int, color: pygame.Color,
+             angle: float = 0, origin: Point | None = None, flip_x: bool = False, flip_y: bool = False) -> None:
+        if alpha != self._alpha:
+            self.texture.alpha = self._alpha = alpha
+            render_stats.count('alphas')
+        if color != self._color:
+            self.texture.color = color
+            self._color.update(color)
+            render_stats.count('colors')
+
+        self.texture.draw(srcrect, dstrect, angle, origin, flip_x, flip_y)
+
+
+class Sprite:
+    """A region of an `Atlas`.
+
+    Sprites replace the individual textures cut from the spritesheet, so they
+    implement the parts of the `sdl2.Texture` interface used by the game.
+    `alpha` and `color` belong to the sprite and are only applied to the
+    atlas when the sprite is drawn.
+    """
+
+    __slots__ = ('atlas', 'srcrect', 'alpha', '_color')
+
+    def __init__(self, atlas: Atlas, srcrect: RectLike) -> None:
+        self.atlas = atlas
+        self.srcrect = pygame.Rect(srcrect)
+        self.alpha = 255
+        self._color = pygame.Color('white')
+
+    def __repr__(self) -> str:
+        return f'Sprite({self.srcrect})'
+
+    @property
+    def color(self) -> pygame.Color:
+        return self._color
+
+    @color.setter
+    def color(self, value: ColorLike) -> None:
+        self._color = pygame.Color(value)
+
+    @property
+    def renderer(self) -> sdl2.Renderer:
+        return self.atlas.renderer
+
+    @property
+    def width(self) -> int:
+        return self.srcrect.width
+
+    @property
+    def height(self) -> int:
+        return self.srcrect.height
+
+    def get_rect(self, **kwargs) -> pygame.Rect:
+        rect = pygame.Rect((0, 0), self.srcrect.size)
+        for k, v in kwargs.items():
+            setattr(rect, k, v)
+
+        return rect
+
+    def draw(self, srcrect: RectLike | None = None, dstrect: RectLike | None = None,
+             angle: float = 0, origin: Point | None = None,
+             flip_x: bool = False, flip_y: bool = False) -> None:
+        if srcrect is None:
+            srcrect = self.srcrect
+        else:
+            srcrect = pygame.Rect(srcrect).move(self.srcrect.topleft).clip(self.srcrect)
+
+        self.atlas.draw(srcrect, dstrect, self.alpha, self._color, angle, origin, flip_x, flip_y)
@@ -0,0 +1,66 @@
+from collections.abc import Hashable
+from contextlib import contextmanager
+
+import pygame
+import pygame._sdl2 as sdl2
+
+import missilecommand.config as C
+
+from missilecommand.renderstats import render_stats
+
+
+class BackgroundLayer:
+    """A cached render target for the entities that rarely change.
+
+    Entities with `Prop.IS_BACKGROUND` (cities, ruins, static labels) are
+    drawn into this texture only when something about them changes, the
+    frame then needs just a single draw of the whole layer.  In the game,
+    the layer goes on top of the missile trails, so the ground is drawn
+    separately below them.
+
+    Adding, removing or moving members must be announced via `invalidate`.
+    Animations and label updates are picked up by comparing the frame keys
+    of all members, see `non_ecs_sys_draw_background`.
+    """
+
+    def __init__(self) -> None:
+        self.texture = None
+        self.dirty = True
+        self.frames = None
+        self.renders = 0
+
+    def __repr__(self) -> str:
+        return f'BackgroundLayer(dirty={self.dirty}, renders={self.renders})'
+
+    def invalidate(self) -> None:
+        self.dirty = True
+
+    def is_stale(self, frames: list[Hashable]) -> bool:
+        return self.dirty or frames != self.frames
+
+    @contextmanager
+    def render(self, renderer: sdl2.Renderer, size: tuple[int, int], frames: list[Hashable]):
+        """Redirect drawing into the cleared layer."""
+        if (self.texture is None
+                or self.texture.renderer is not renderer
+                or (self.texture.width, self.texture.height) != tuple(size)):
+            self.texture = sdl2.Texture(renderer, size, target=True)
+            self.texture.blend_mode = pygame.BLENDMODE_BLEND
+
+        bkp_color = renderer.draw_color
+        with render_stats.render_target(renderer, self.texture):
+            render_stats.set_color(renderer, C.COLOR.clear)
+            render_stats.clear(renderer)
+            yield self.texture
+        render_stats.set_color(renderer, bkp_color)
+
+        self.frames = frames
+        self.dirty = False
+        self.renders += 1
+
+    def draw(self) -> None:
+        if self.texture is not None:
+            render_stats.draw(self.texture)
+
+
+background = BackgroundLayer()
@@ -0,0 +1,106 @@
+from math import ceil, floor
+from typing import Any
+
+import pygame
+
+from pygame.typing import Point, RectLike
+
+import missilecommand.config as C
+
+from missilecommand.coverage import CoverageField
+from missilecommand.explosions import ExplosionRegistry
+
+
+class SpatialHash:
+    """A uniform grid over a fixed area for broadphase collision queries.
+
+    Items are registered with their bounding rect in every cell the rect
+    touches.  A query then only returns the items sharing a cell with the
+    queried point or rect, so the narrow phase only needs to test those.
+
+    Coordinates outside of `bounds` are clamped to the border cells, so
+    off-screen objects are still found.
+    """
+
+    def __init__(self, bounds: RectLike, cell_size: int) -> None:
+        self.bounds = pygame.Rect(bounds)
+        self.cell_size = cell_size
+        self.cols = ceil(self.bounds.width / cell_size)
+        self.rows = ceil(self.bounds.height / cell_size)
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+
+    def __len__(self) -> int:
+        return sum(len(cell) for cell in self.cells)
+
+    def _col(self, x: float) -> int:
+        return min(max(floor((x - self.bounds.left) / self.cell_size), 0), self.cols - 1)
+
+    def _row(self, y: float) -> int:
+        return min(max(floor((y - self.bounds.top) / self.cell_size), 0), self.rows - 1)
+
+    def clear(self) -> None:
+        for cell in self.cells:
+            cell.clear()
+
+    def insert(self, item: Any, left: float, top: float, right: float, bottom: float) -> None:
+        """Register item in all cells touched by the given extent."""
+        c0, c1 = self._col(left), self._col(right)
+        r0, r1 = self._row(top), self._row(bottom)
+        for row in range(r0, r1 + 1):
+            offset = row * self.cols
+            for col in range(c0, c1 + 1):
+                self.cells[offset + col].append(item)
+
+    def insert_rect(self, item: Any, rect: RectLike) -> None:
+        rect = pygame.Rect(rect)
+        self.insert(item, rect.left, rect.top, rect.right, rect.bottom)
+
+    def insert_circle(self, item: Any, center: Point, radius: float) -> None:
+        x, y = center
+        self.insert(item, x - radius, y - radius, x + radius, y + radius)
+
+    def query_point(self, pos: Point) -> list[Any]:
+        """All items sharing the cell with pos, in insertion order."""
+        return self.cells[self._row(pos[1]) * self.cols + self._col(pos[0])]
+
+    def query_rect(self, rect: RectLike) -> list[Any]:
+        """All items in cells touched by rect, without duplicates."""
+        rect = pygame.Rect(rect)
+        c0, c1 = self._col(rect.left), self._col(rect.right)
+        r0, r1 = self._row(rect.top), self._row(rect.bottom)
+
+        found = {}
+        for row in range(r0, r1 + 1):
+            offset = row * self.cols
+            for col in range(c0, c1 + 1):
+                for item in self.cells[offset + col]:
+                    found.setdefault(id(item), item)
+
+        return list(found.values())
+
+
+class Broadphase:
+    """The spatial indices shared by all collision systems.
+
+    Cities and batteries never move, so their hitboxes are only indexed once.
+    The explosions are stamped into a `CoverageField` every time the
+    collision systems run (see `non_ecs_sys_update_broadphase`).
+    """
+
+    def __init__(self, bounds: RectLike = C.SCREEN, cell_size: int = C.BROADPHASE_CELL_SIZE) -> None:
+        self.coverage = CoverageField(bounds)
+
+        self.cities = SpatialHash(bounds, cell_size)
+        for i, hitbox in enumerate(C.HITBOX_CITY):
+            self.cities.insert_rect(i, hitbox)
+
+        self.batteries = SpatialHash(bounds, cell_size)
+        for i, hitbox in enumerate(C.HITBOX_BATTERIES):
+            self.batteries.insert_rect(i, hitbox)
+
+    def index_explosions(self, registry: ExplosionRegistry) -> None:
+        self.coverage.clear()
+        n = len(registry)
+        columns = (registry.center[:n], registry.radius[:n], registry.growing[:n], registry.scale[:n])
+        for row, item in enumerate(zip(*(a.tolist() for a in columns))):
+            self.coverage.stamp(row, *item)
@@ -139,6 +139,14 @@ POS_CITIES_SCORE_DEBRIEFING = vec2(GRID(14, 14, 1, 1).midright)
 
 EXPLOSION_RADIUS = 16
 EXPLOSION_DURATION = 1.5
+EXPLOSION_EVADE_RADIUS = 1.5 * EXPLOSION_RADIUS
+
+EXPLOSION_SCALE_RANGE = (0.1, 1)
+# Resolution of the precomputed explosion masks, see ScaledMaskCache
+EXPLOSION_MASK_STEPS = 64
+
+# Cell size of the spatial hash used by the collision systems
+BROADPHASE_CELL_SIZE = 32
 EXPLOSION_COLORS = ('white', '#ffd541', '#a6fcdb', '#df3e23', '#20d6c7', '#d6f264')
 
 KEY_SILO_MAP = {
@@ -146,6 +154,26 @@ KEY_SILO_MAP = {
     pygame.K_w: 1,
     pygame.K_e: 2,
 }
+KEY_PROFILER = pygame.K_F10
+
+# Samples kept per system by the profiler, 10 seconds of frames
+PROFILER_CAPACITY = 10 * FPS
+
+# Events buffered for the trace writer thread before new ones are dropped
+TRACE_QUEUE_SIZE = 65536
+
+# Live metrics, see metrics.py
+METRICS_INTERVAL = 0.5
+METRICS_FRAME_BUCKETS = (1 / 240, 1 / 120, 1 / 60, 1 / 30, 1 / 15, 0.1, 0.25)
+
+# Show fps, incoming slots and entities in the window title
+WINDOW_TITLE_STATS = True
+
+# Perf overlay, see DebugLayer: frames in the graph, refresh interval in
+# seconds and number of systems listed
+HUD_FRAMES = 120
+HUD_REFRESH = 0.25
+HUD_SYSTEMS = 12
 
 MISSILE_SPEEDS = [136, 272, 136]
 
@@ -324,8 +352,32 @@ MISSILE_SPLITS = 3
 PLANE_SPEED = 20
 SATELLITE_SPEED = 30
 MAX_SMARTBOMBS_ON_SCREEN = 3
+MAX_FLYERS_ON_SCREEN = 1
 LOW_AMMO_WARN_THRESHOLD = 3
 
+# Multiplies the missiles and smartbombs of every wave
+WAVE_LOAD_FACTOR = 1
+
+# Selected with --stress, lifts the arcade limits above by orders of
+# magnitude to find out where the game stops scaling.
+STRESS_PROFILE = {
+    'INCOMING_SLOTS': 1024,
+    'MAX_LAUNCHES_PER_FRAME': 64,
+    'MAX_SMARTBOMBS_ON_SCREEN': 64,
+    'MAX_FLYERS_ON_SCREEN': 32,
+    'WAVE_LOAD_FACTOR': 100,
+}
+
+# Seconds between two lines of the load log, see --load-log
+LOAD_LOG_INTERVAL = 1.0
+
+# Move missiles and smartbombs with the vectorized MotionStore instead of the
+# per entity systems, see --motion-store
+MOTION_STORE = False
+
+# Retired missiles, explosions and targets kept for reuse per kind, see EntityPool
+ENTITY_POOL_CAPACITY = 256
+
 CITY_ATTACKS = 3
 SILO_ATTACKS = 3
 
@@ -352,6 +404,10 @@ class Events(IntEnum):
 #
 ########################################################################
 
+# Number of pre-rendered label textures kept by draw_text, see LabelCache
+LABEL_CACHE_SIZE = 128
+
+
 class MessageConfig(NamedTuple):
     text: str
     pos: Point
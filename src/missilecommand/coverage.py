@@ -0,0 +1,122 @@
+from math import ceil, floor
+
+import numpy as np
+import pygame
+
+from ddframework.cache import cache
+from pygame.typing import Point, RectLike
+
+import missilecommand.config as C
+
+
+class CoverageField:
+    """All explosions of a frame rasterized into screen sized bitmaps.
+
+    Every explosion is stamped once per collision round, after that, testing
+    an object against all explosions is a lookup into the field, no matter
+    how many explosions there are.
+
+        lethal  -- pixels inside the lethal radius of any explosion
+        evade   -- registry row of the newest growing explosion a smartbomb
+                   at this pixel is in evade reach of, -1 if none
+        mask()  -- the scaled explosion masks drawn into one `Mask` for the
+                   pixel exact flyer collisions, only built if asked for
+
+    A pixel counts as covered if its center is within the radius.  Points
+    outside of `bounds` are never covered.
+    """
+
+    def __init__(self, bounds: RectLike = C.SCREEN) -> None:
+        self.bounds = pygame.Rect(bounds)
+        self.lethal = np.zeros((self.bounds.height, self.bounds.width), dtype=bool)
+        self.evade = np.full((self.bounds.height, self.bounds.width), -1, dtype=np.int32)
+        self.stamps = []
+        self._mask = None
+
+    def __repr__(self) -> str:
+        return f'CoverageField({self.bounds}, stamps={len(self.stamps)})'
+
+    def __len__(self) -> int:
+        return len(self.stamps)
+
+    def clear(self) -> None:
+        self.lethal.fill(False)
+        self.evade.fill(-1)
+        self.stamps.clear()
+        self._mask = None
+
+    def stamp(self, row: int, center: Point, radius: float, growing: bool, scale: float) -> None:
+        """Rasterize the explosion in registry row into the field."""
+        self.stamps.append((center, scale))
+        self._mask = None
+
+        reach = max(radius, C.EXPLOSION_EVADE_RADIUS) if growing else radius
+        cx = center[0] - self.bounds.left
+        cy = center[1] - self.bounds.top
+        x0, x1 = max(floor(cx - reach), 0), min(ceil(cx + reach) + 1, self.bounds.width)
+        y0, y1 = max(floor(cy - reach), 0), min(ceil(cy + reach) + 1, self.bounds.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        dx = np.arange(x0, x1) + 0.5 - cx
+        dy = np.arange(y0, y1) + 0.5 - cy
+        d2 = dy[:, np.newaxis] ** 2 + dx[np.newaxis, :] ** 2
+
+        self.lethal[y0:y1, x0:x1] |= d2 <= radius * radius
+        if growing:
+            # Later explosions win.  The smartbomb system still needs to
+            # check which of them are ahead of the bomb.
+            self.evade[y0:y1, x0:x1][d2 < C.EXPLOSION_EVADE_RADIUS ** 2] = row
+
+    def lookup(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return the lethal flags and evade rows for m x 2 points."""
+        hit = np.zeros(len(points), dtype=bool)
+        evade = np.full(len(points), -1, dtype=np.int32)
+        if not len(points):
+            return hit, evade
+
+        xs = np.floor(points[:, 0] - self.bounds.left).astype(int)
+        ys = np.floor(points[:, 1] - self.bounds.top).astype(int)
+        inside = (xs >= 0) & (xs < self.bounds.width) & (ys >= 0) & (ys < self.bounds.height)
+        hit[inside] = self.lethal[ys[inside], xs[inside]]
+        evade[inside] = self.evade[ys[inside], xs[inside]]
+
+        return hit, evade
+
+    def sweep(self, starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Like `lookup`, but hit along the whole segments from starts to ends.
+
+        The segments are sampled at least every half pixel, so nothing
+        tunnels through the rim of an explosion.  The evade rows are the ones
+        at the end points.
+        """
+        if not len(ends):
+            return self.lookup(ends)
+
+        _, evade = self.lookup(ends)
+        delta = ends - starts
+        steps = int(np.ceil(np.hypot(delta[:, 0], delta[:, 1]).max() * 2)) + 1
+        t = np.linspace(0, 1, steps)[np.newaxis, :, np.newaxis]
+        samples = starts[:, np.newaxis, :] + delta[:, np.newaxis, :] * t
+        swept, _ = self.lookup(samples.reshape(-1, 2))
+
+        return swept.reshape(len(ends), steps).any(axis=1), evade
+
+    def mask(self) -> pygame.mask.Mask:
+        if self._mask is None:
+            self._mask = pygame.mask.Mask(self.bounds.size)
+            scaled_masks = cache['scaled-masks']['explosions']
+            for center, scale in self.stamps:
+                scaled_mask = scaled_masks.get(scale)
+                rect = scaled_mask.get_rect(center=center)
+                self._mask.draw(scaled_mask, (rect.left - self.bounds.left, rect.top - self.bounds.top))
+
+        return self._mask
+
+    def overlap(self, mask: pygame.mask.Mask, topleft: Point) -> bool:
+        """Pixel exact test of mask at topleft against all explosions."""
+        if not self.stamps:
+            return False
+
+        offset = (topleft[0] - self.bounds.left, topleft[1] - self.bounds.top)
+        return self.mask().overlap(mask, offset) is not None
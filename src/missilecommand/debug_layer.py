@@ -1,13 +1,61 @@
+from collections import deque
+
+import pygame
+import pygame._sdl2 as sdl2
+import tinyecs as ecs
+
+from pgcooldown import Cooldown
+
 import missilecommand.config as C
 from ddframework.app import GameState, StackPermissions
 from ddframework.gridlayout import debug_grid
 
+from missilecommand.labelcache import draw_glyphs
+from missilecommand.profiler import profiler
+from missilecommand.renderstats import render_stats
+from missilecommand.types import Prop
+
+GLYPH = pygame.Rect(0, 0, 4, 4)
+GRAPH = pygame.Rect(2, 2, C.HUD_FRAMES, 24)
+BAR_WIDTH = 48
+
+
+def hud_text(text: str) -> str:
+    """The font only knows upper case and a few symbols."""
+    return ''.join(c if c in C.CHAR_MAP else ' ' for c in text.upper())
+
 
 class DebugLayer(GameState):
-    def __init__(self, app, walker):
+    """Debug layer below the running game states, with an overlay on top.
+
+    The layer itself sits at the bottom of the stack and optionally draws the
+    layout grid below everything else.
+
+    The overlay shows a frame time graph, the most expensive systems from the
+    profiler and the entity count per `Prop`.  It is rendered into a cached
+    texture, which is refreshed every `C.HUD_REFRESH` seconds.  To stay
+    visible in states that clear the screen, `app.draw` is wrapped to draw it
+    after the whole state stack.
+    """
+
+    def __init__(self, app, walker, grid=False):
         self.app = app
         self.renderer = self.app.renderer
         self.walker = walker
+        self.grid = grid
+
+        self.frame_times = deque(maxlen=C.HUD_FRAMES)
+        self.cd_refresh = Cooldown(C.HUD_REFRESH)
+        self.texture = None
+
+        app_draw = self.app.draw
+
+        def draw_with_overlay(*args, **kwargs):
+            res = app_draw(*args, **kwargs)
+            self.draw_overlay()
+            return res
+
+        self.app.draw = draw_with_overlay
 
     def reset(self, *args, **kwargs):
         self.app.push(self.walker, passthrough=StackPermissions.DRAW)
@@ -16,6 +64,80 @@ class DebugLayer(GameState):
         pass
 
     def draw(self):
-        self.renderer.draw_color = C.COLOR.background
-        self.renderer.clear()
-        debug_grid(self.renderer, C.GRID, 'grey20')
+        render_stats.set_color(self.renderer, C.COLOR.background)
+        render_stats.clear(self.renderer)
+        if self.grid:
+            debug_grid(self.renderer, C.GRID, 'grey20')
+
+    def draw_overlay(self):
+        # Without the frame limiter sleep, this is what the frame costs
+        self.frame_times.append(self.app.clock.get_rawtime())
+
+        if self.texture is None or self.cd_refresh.cold():
+            self.cd_refresh.reset()
+            self.refresh()
+
+        render_stats.draw(self.texture)
+
+    def refresh(self):
+        """Re-render the overlay texture."""
+        if self.texture is None:
+            self.texture = sdl2.Texture(self.renderer, self.app.logical_rect.size, target=True)
+            self.texture.blend_mode = pygame.BLENDMODE_BLEND
+
+        bkp_color = self.renderer.draw_color
+        with render_stats.render_target(self.renderer, self.texture):
+            render_stats.set_color(self.renderer, C.COLOR.clear)
+            render_stats.clear(self.renderer)
+
+            self.draw_graph()
+            self.draw_systems(pygame.Rect(GRAPH.right + 4, 2, 0, 0))
+            self.draw_entities(pygame.Rect(2, GRAPH.bottom + GLYPH.height + 4, 0, 0))
+        render_stats.set_color(self.renderer, bkp_color)
+
+    def draw_graph(self):
+        """Frame times as vertical lines, the budget of one frame as reference."""
+        scale = GRAPH.height / (3000 / C.FPS)
+
+        render_stats.set_color(self.renderer, (0, 0, 0, 128))
+        render_stats.fill_rect(self.renderer, GRAPH)
+
+        render_stats.set_color(self.renderer, 'green')
+        for x, ms in enumerate(self.frame_times, start=GRAPH.left):
+            height = min(ms * scale, GRAPH.height)
+            render_stats.draw_line(self.renderer, (x, GRAPH.bottom - 1), (x, GRAPH.bottom - 1 - height))
+
+        budget = GRAPH.bottom - 1 - 1000 / C.FPS * scale
+        render_stats.set_color(self.renderer, 'red')
+        render_stats.draw_line(self.renderer, (GRAPH.left, budget), (GRAPH.right - 1, budget))
+
+        fps = self.app.clock.get_fps()
+        draw_glyphs(hud_text(f'{fps:5.1f} FPS  {len(ecs.eidx)} ENTITIES'),
+                    GLYPH.move_to(topleft=(GRAPH.left, GRAPH.bottom + 1)), 'white')
+
+    def draw_systems(self, pos):
+        """Bars of the mean cost per system relative to the frame budget."""
+        if not profiler.enabled:
+            draw_glyphs(hud_text('PROFILER OFF'), GLYPH.move_to(topleft=pos.topleft), 'grey')
+            return
+
+        stats = sorted(profiler.stats().items(), key=lambda item: item[1]['mean_ms'], reverse=True)
+        budget = 1000 / C.FPS
+        row = GLYPH.move_to(topleft=pos.topleft)
+        render_stats.set_color(self.renderer, 'orange')
+        for name, stat in stats[:C.HUD_SYSTEMS]:
+            width = max(1, round(BAR_WIDTH * min(stat['mean_ms'] / budget, 1)))
+            render_stats.fill_rect(self.renderer, (row.left, row.top, width, row.height - 1))
+            label = hud_text(f'{stat["mean_ms"]:5.2f} {name.removeprefix("non_ecs_").removeprefix("sys_")}')
+            draw_glyphs(label, row.move(BAR_WIDTH + 2, 0), 'white')
+            row.y += row.height + 1
+
+    def draw_entities(self, pos):
+        """Live entity count for every Prop in use."""
+        row = GLYPH.move_to(topleft=pos.topleft)
+        for prop in Prop:
+            count = len(ecs.eids_by_property(prop))
+            if not count:
+                continue
+            draw_glyphs(hud_text(f'{count:4d} {prop.removeprefix("is_")}'), row, 'white')
+            row.y += row.height + 1
@@ -9,6 +9,7 @@ from ddframework.app import App, GameState, StateExit
 import missilecommand.config as C
 
 from missilecommand.launchers import mk_textlabel
+from missilecommand.renderstats import render_stats
 from missilecommand.systems import sys_draw_textlabel
 from missilecommand.utils import check_for_exit
 from missilecommand.types import Comp
@@ -46,8 +47,8 @@ class Demo(GameState):
             raise StateExit
 
     def draw(self) -> None:
-        self.app.renderer.draw_color = C.COLOR.background
-        self.app.renderer.clear()
+        render_stats.set_color(self.app.renderer, C.COLOR.background)
+        render_stats.clear(self.app.renderer)
         ecs.run_system(0, sys_draw_textlabel, Comp.TEXT, Comp.PRSA, Comp.ANCHOR, Comp.COLOR)
 
     def teardown(self) -> None:
@@ -0,0 +1,125 @@
+import numpy as np
+
+from ddframework.dynamicsprite import PRSA
+from pgcooldown import Cooldown
+
+import missilecommand.config as C
+
+from missilecommand.types import EntityID
+
+
+class ExplosionRegistry:
+    """Spawn time and center of all explosions, evaluated once per tick.
+
+    An explosion grows from `C.EXPLOSION_SCALE_RANGE[0]` to `[1]` in
+    `C.EXPLOSION_DURATION` seconds and shrinks back in the same time, see the
+    `LerpThing` in `mk_explosion`.  That is simple enough to compute for all
+    explosions in one go from their age, instead of calling every lerp from
+    every system that needs it.
+
+    `update` fills `scale`, `radius` and `growing` for the first `size` rows,
+    the collision systems and `non_ecs_sys_explosions` only read these.  The
+    age is read from a `Cooldown` created on `clear`, so the registry runs on
+    the same clock as the lerps, even in headless mode.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.clock = None
+        self.size = 0
+        self.eids = []
+        self.prsas = []
+        self.spawn = np.zeros(capacity)
+        self.center = np.zeros((capacity, 2))
+        self.scale = np.zeros(capacity)
+        self.radius = np.zeros(capacity)
+        self.growing = np.zeros(capacity, dtype=bool)
+
+    def __repr__(self) -> str:
+        return f'ExplosionRegistry(size={self.size}, capacity={len(self.spawn)})'
+
+    def __len__(self) -> int:
+        return self.size
+
+    def now(self) -> float:
+        if self.clock is None:
+            self.clock = Cooldown(0)
+
+        return -self.clock.temperature
+
+    def clear(self) -> None:
+        self.clock = Cooldown(0)
+        self.size = 0
+        self.eids.clear()
+        self.prsas.clear()
+
+    def reserve(self, n: int) -> None:
+        capacity = len(self.spawn)
+        if n <= capacity:
+            return
+
+        while capacity < n:
+            capacity *= 2
+
+        for name in ('spawn', 'center', 'scale', 'radius', 'growing'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def add(self, eid: EntityID, prsa: PRSA) -> int:
+        """Register a freshly spawned explosion, return its row.
+
+        The row is valid until the next `update`.
+        """
+        row = self.size
+        self.reserve(row + 1)
+        self.size += 1
+
+        self.eids.append(eid)
+        self.prsas.append(prsa)
+        self.spawn[row] = self.now()
+        self.center[row] = prsa.pos
+        self.scale[row] = C.EXPLOSION_SCALE_RANGE[0]
+        self.radius[row] = self.scale[row] * C.EXPLOSION_RADIUS
+        self.growing[row] = True
+
+        return row
+
+    def update(self) -> list[EntityID]:
+        """Evaluate all explosions for this tick, return the finished ones.
+
+        Finished explosions are dropped from the registry.
+        """
+        n = self.size
+        if not n:
+            return []
+
+        lo, hi = C.EXPLOSION_SCALE_RANGE
+        t = (self.now() - self.spawn[:n]) / C.EXPLOSION_DURATION
+        finished = t >= 2
+
+        done = []
+        if finished.any():
+            keep = ~finished
+            done = [eid for eid, f in zip(self.eids, finished.tolist()) if f]
+            self.eids = [eid for eid, k in zip(self.eids, keep.tolist()) if k]
+            self.prsas = [prsa for prsa, k in zip(self.prsas, keep.tolist()) if k]
+            t = t[keep]
+            n = self.size = len(t)
+            self.spawn[:n] = self.spawn[:len(keep)][keep]
+            self.center[:n] = self.center[:len(keep)][keep]
+
+        growing = t < 1
+        self.growing[:n] = growing
+        self.scale[:n] = np.where(growing, lo + (hi - lo) * t, hi - (hi - lo) * (t - 1))
+        self.radius[:n] = self.scale[:n] * C.EXPLOSION_RADIUS
+
+        return done
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Centers (n x 2), lethal radii and growing flags of all explosions."""
+        n = self.size
+        return self.center[:n], self.radius[:n], self.growing[:n]
+
+
+explosion_registry = ExplosionRegistry()
@@ -1,10 +1,9 @@
 from enum import StrEnum, auto
 from itertools import chain, cycle
 from random import randint, seed, shuffle
-from typing import Any
+from typing import Any, NamedTuple
 
 import pygame
-import pygame._sdl2 as sdl2
 import tinyecs as ecs
 
 from pgcooldown import Cooldown
@@ -19,6 +18,9 @@ from ddframework.statemachine import StateMachine
 
 import missilecommand.config as C
 
+from missilecommand.background import background
+from missilecommand.broadphase import Broadphase
+from missilecommand.explosions import explosion_registry
 from missilecommand.game.briefing import Briefing
 from missilecommand.game.debriefing import Debriefing
 from missilecommand.game.demoplayer import DemoPlayer
@@ -27,33 +29,45 @@ from missilecommand.game.pause import Pause
 from missilecommand.game.waves import wave_iter
 from missilecommand.gamestate import gs as GS
 from missilecommand.highscoretable import highscoretable
+from missilecommand.impacts import impact_schedule
 from missilecommand.launchers import (mk_battery, mk_city, mk_crosshair,
                                       mk_flyer, mk_quickhelp, mk_missile,
                                       mk_ruin, mk_score_label, mk_smartbomb,
                                       mk_target, mk_textlabel, mk_texture)
+from missilecommand.loadlog import load_log
+from missilecommand.metrics import metrics
+from missilecommand.motion import motion_store
+from missilecommand.pool import entity_pool
+from missilecommand.profiler import profiler
+from missilecommand.renderstats import render_stats
 from missilecommand.systems import (non_ecs_sys_collide_flyer_with_explosion,
-                                    non_ecs_sys_collide_missile_with_battery,
-                                    non_ecs_sys_collide_missile_with_city,
+                                    non_ecs_sys_collide_missile_with_ground,
                                     non_ecs_sys_collide_missile_with_explosion,
-                                    non_ecs_sys_collide_smartbomb_with_battery,
-                                    non_ecs_sys_collide_smartbomb_with_city,
+                                    non_ecs_sys_collide_smartbomb_with_ground,
                                     non_ecs_sys_collide_smartbomb_with_explosion,
                                     non_ecs_sys_debug_prune,
-                                    non_ecs_sys_prune, sys_aim,
+                                    non_ecs_sys_draw_background,
+                                    non_ecs_sys_draw_trails,
+                                    non_ecs_sys_explosions,
+                                    non_ecs_sys_motion,
+                                    non_ecs_sys_prune,
+                                    non_ecs_sys_resolve_contacts,
+                                    non_ecs_sys_update_broadphase, sys_aim,
                                     sys_close_orphan_sound, sys_container,
                                     sys_debug_line, sys_debug_rect,
                                     sys_detonate_flyer, sys_detonate_missile,
                                     sys_detonate_smartbomb,
-                                    sys_dont_overshoot, sys_explosion,
+                                    sys_dont_overshoot,
                                     sys_lifetime, sys_momentum, sys_mouse,
+                                    sys_remember_pos,
                                     sys_shutdown, sys_target_reached,
                                     sys_draw_textlabel, sys_draw_texture,
                                     sys_smartbomb_evade, sys_textblink,
                                     sys_texture_from_texture_list,
-                                    sys_trail_eraser, sys_trail,
                                     sys_update_trail,)
+from missilecommand.tracer import tracer
 from missilecommand.types import Comp, EIDs, EntityID, Prop
-from missilecommand.utils import (cls, pause_all_sounds, play_sound,
+from missilecommand.utils import (pause_all_sounds, play_sound,
                                   purge_entities, stop_all_sounds,
                                   unpause_all_sounds)
 
@@ -68,10 +82,26 @@ class StatePhase(StrEnum):
     GAMEOVER = auto()
 
 
+class Warp(NamedTuple):
+    """Start a game at a later wave instead of the first one.
+
+    `wave` is the index into `C.WAVES`, `cities` the number of cities still
+    standing, counted from the left.  If `score_mult` is None, the
+    multiplier of the wave is used.  Without `briefing`, no `Briefing` is
+    shown before any wave.
+    """
+    wave: int
+    score_mult: int | None = None
+    cities: int = 6
+    bonus_cities: int = 0
+    briefing: bool = True
+
+
 class Game(GameState):
-    def __init__(self, app: App, demo=False) -> None:
+    def __init__(self, app: App, demo=False, warp: Warp | None = None) -> None:
         self.app = app
         self.demo = demo
+        self.warp = warp
         self.renderer = self.app.renderer
 
         self.demo_player = DemoPlayer(C.ASSETS / 'demo.in')
@@ -79,8 +109,8 @@ class Game(GameState):
 
         ecs.create_entity(EIDs.FLYER_SOUND)
         ecs.create_entity(EIDs.SMARTBOMB_SOUND)
-        self.trail_canvas = sdl2.Texture(self.renderer, self.app.logical_rect.size, target=True)
-        self.trail_canvas.blend_mode = pygame.BLENDMODE_BLEND
+
+        self.broadphase = Broadphase()
 
         self.paused = None
         self.level = None
@@ -129,16 +159,28 @@ class Game(GameState):
         self.level = -1
         self.wave = None
         self.wave_iter = wave_iter()
-        self.phase_walker = self.phases.walker()
+        self.phase_walker = tracer.walker('Game', self.phases.walker())
         self.phase = next(self.phase_walker)
 
         GS.cities = [True] * 6
 
+        if self.warp is not None:
+            for _ in range(self.warp.wave):
+                next(self.wave_iter)
+            self.level = self.warp.wave - 1
+            GS.cities = [i < self.warp.cities for i in range(len(GS.cities))]
+            GS.bonus_cities = self.warp.bonus_cities
+
         ecs.reset()
+        explosion_registry.clear()
+        impact_schedule.clear()
+        motion_store.clear()
         ecs.create_archetype(Comp.PRSA)  # for Smartbomb collisions, but useful in general
         ecs.create_archetype(Comp.PRSA, Comp.MASK)  # for Flyer collisions
         ecs.create_archetype(Comp.PRSA, Comp.MASK, Comp.SCALE)  # for Explosion collisions
-        ecs.create_archetype(Comp.PRSA, Comp.TARGET, Comp.MOMENTUM)  # For smartbomb evasion
+        ecs.create_archetype(Comp.PRSA, Comp.PREV_POS, Comp.MOMENTUM)  # For smartbomb evasion
+        ecs.create_archetype(Comp.TRAIL)  # for the batched trail pass
+        ecs.create_archetype(Comp.PRSA, Comp.PREV_POS, Comp.GROUND_TARGET)  # for smartbomb ground collisions
 
         mk_crosshair(self.app.logical_rect.center)
 
@@ -152,7 +194,9 @@ class Game(GameState):
         msg = C.MESSAGES['game']['BONUS CITIES']
         prsa = PRSA(pos=msg.pos, scale=(0.8, 0.8))
         mk_textlabel(f' x {GS.bonus_cities}', *msg[1:], eid=EIDs.BONUS_CITIES)
-        mk_texture(cache['textures']['small-cities'][0], prsa, anchor='midright')
+        eid = mk_texture(cache['textures']['small-cities'][0], prsa, anchor='midright')
+        ecs.set_property(eid, Prop.IS_BACKGROUND)
+        background.invalidate()
 
         self.cd_flyer = None
 
@@ -171,8 +215,10 @@ class Game(GameState):
         purge_entities(Prop.IS_SMARTBOMB)
         purge_entities(Prop.IS_SILO)
         purge_entities(Prop.IS_TARGET)
-
-        cls(self.trail_canvas, C.COLOR.clear)
+        explosion_registry.clear()
+        impact_schedule.clear()
+        motion_store.clear()
+        background.invalidate()
 
         GS.batteries = [mk_battery(i, pos)[1] for i, pos in enumerate(C.POS_BATTERIES)]
 
@@ -199,15 +245,19 @@ class Game(GameState):
         self.level += 1
 
         GS.score_mult = min(self.level // 2 + 1, C.MAX_SCORE_MULT)
+        if self.warp is not None and self.warp.score_mult and self.level == self.warp.wave:
+            GS.score_mult = self.warp.score_mult
 
-        self.incoming_left = self.wave.missiles
+        self.incoming_left = self.wave.missiles * C.WAVE_LOAD_FACTOR
         self.incoming = Incoming(C.INCOMING_SLOTS)
 
         self.cd_flyer = Cooldown(self.wave.flyer_cooldown)
         self.cd_flyer_shoot = Cooldown(self.wave.flyer_shoot_cooldown)
 
-        self.smartbombs_left = self.wave.smartbombs
-        self.smartbombs = Incoming(3)
+        self.smartbombs_left = self.wave.smartbombs * C.WAVE_LOAD_FACTOR
+        self.smartbombs = Incoming(C.MAX_SMARTBOMBS_ON_SCREEN)
+
+        self.flyers = Incoming(C.MAX_FLYERS_ON_SCREEN)
 
     def restart(self, from_state: GameState, result: object) -> None:
         unpause_all_sounds()
@@ -231,23 +281,37 @@ class Game(GameState):
             elif e.key == pygame.K_p:
                 self.app.push(Pause(self.app), passthrough=StackPermissions.DRAW)
                 pause_all_sounds()
+            elif e.key == C.KEY_PROFILER:
+                profiler.toggle()
 
     def update(self, dt: float) -> None:
         if self.paused: return
         if self.app.is_stacked(self): return
 
-        update_fn = self.phase_handlers[self.phase]
-        update_fn(dt)
+        with metrics.timed():
+            update_fn = self.phase_handlers[self.phase]
+            update_fn(dt)
         fps = self.app.clock.get_fps()
-        entities = len(ecs.eidx)
-        self.app.window.title = f'{self.app.title} - {fps=:.2f}  slots={len(self.incoming)}  left={self.incoming_left}  {entities=}'
+        metrics.update(fps, incoming_slots=len(self.incoming), incoming_left=self.incoming_left,
+                       pool_hit_rate=entity_pool.hit_rate)
+        load_log.update(self.app.clock.get_rawtime(), len(ecs.eidx), len(self.incoming))
+
+        if C.WINDOW_TITLE_STATS:
+            entities = len(ecs.eidx)
+            draws = render_stats.frame['draws']
+            targets = render_stats.frame['targets']
+            self.app.window.title = f'{self.app.title} - {fps=:.2f}  slots={len(self.incoming)}  left={self.incoming_left}  {entities=}  {draws=}  {targets=}'
 
     def update_setup_phase(self, dt: float) -> None:
-        self.setup_wave()
+        with tracer.span('setup_wave'):
+            self.setup_wave()
         self.phase = next(self.phase_walker)
 
     def update_briefing_phase(self, dt: float) -> None:
         self.phase = next(self.phase_walker)
+        if self.warp is not None and not self.warp.briefing:
+            return
+
         cities = sum(GS.cities)
 
         self.app.push(Briefing(self.app, GS.score_mult, cities), passthrough=StackPermissions.DRAW)
@@ -286,12 +350,12 @@ class Game(GameState):
         launched_this_frame = 0
 
         # Launch flyer if
-        #     no flyer is active
+        #     a flyer slot is free (only 1 in the arcade)
         #     and the wave does have a flyer
         #     and flyer cooldown is cold
         #     and an incoming slot is free
         free_slots = self.incoming.free_slots() - 2 * len(self.smartbombs)
-        if (not ecs.has(EIDs.FLYER)
+        if (self.flyers.free_slots()
                 and self.wave.flyer_cooldown
                 and self.cd_flyer.cold()
                 and free_slots):
@@ -299,12 +363,16 @@ class Game(GameState):
             def shutdown(eid: EntityID) -> None:
                 self.cd_flyer.reset()
                 self.incoming.remove(eid)
-
-            self.incoming.add(mk_flyer(EIDs.FLYER, self.wave.flyer_min_height,
-                                       self.wave.flyer_max_height,
-                                       self.wave.flyer_shoot_cooldown,
-                                       C.CONTAINER,
-                                       shutdown))
+                self.flyers.remove(eid)
+
+            eid = mk_flyer(None, self.wave.flyer_min_height,
+                           self.wave.flyer_max_height,
+                           self.wave.flyer_shoot_cooldown,
+                           C.CONTAINER,
+                           shutdown)
+            self.incoming.add(eid)
+            self.flyers.add(eid)
+            self.cd_flyer.reset()
             launched_this_frame += 1
 
         def spawn_missiles(number=1, origin=None):
@@ -336,9 +404,9 @@ class Game(GameState):
         if may_launch:
             spawn_missiles(C.MAX_LAUNCHES_PER_FRAME - launched_this_frame)
 
-        # Flyer shoots
-        if (ecs.has(EIDs.FLYER)):
-            prsa, cd_shoot = ecs.comps_of_eid(EIDs.FLYER, Comp.PRSA, Comp.FLYER_SHOOT_COOLDOWN)
+        # Flyers shoot
+        for eid in list(self.flyers):
+            prsa, cd_shoot = ecs.comps_of_eid(eid, Comp.PRSA, Comp.FLYER_SHOOT_COOLDOWN)
             if cd_shoot.cold():
                 cd_shoot.reset()
                 spawn_missiles(randint(1, 3), origin=prsa.pos)
@@ -413,6 +481,8 @@ class Game(GameState):
 
         for eid, (momentum, ) in chain(missiles, flyers):
             momentum *= 3
+        impact_schedule.speed_up(3)
+        motion_store.speed_up(3)
 
         # Smartbombs are not momentum based, it's recalculated every frame
         for eid, (speed, ) in smartbombs:
@@ -458,28 +528,32 @@ class Game(GameState):
         raise StateExit
 
     def draw(self) -> None:
-        # Make mouse work even if stackpermissions forbids update
-
-        ecs.run_system(0, sys_mouse, Comp.PRSA,
-                       mouse_pos=self.app.mouse,
-                       has_properties={Comp.WANTS_MOUSE})
-
-        ground = cache['textures']['ground']
-        rect = ground.get_rect(midbottom=self.app.logical_rect.midbottom)
-        ground.draw(dstrect=rect)
-
-        self.trail_canvas.draw()
-        ecs.run_system(0, sys_texture_from_texture_list, Comp.TEXTURE_LIST)
-        ecs.run_system(0, sys_draw_texture, Comp.TEXTURE, Comp.PRSA)
-
-        ecs.run_system(0, sys_textblink, Comp.COLOR_CYCLE)
-        ecs.run_system(0, sys_draw_textlabel, Comp.TEXT, Comp.PRSA, Comp.ANCHOR, Comp.COLOR)
-
-        # This is for debugging only
-        ecs.run_system(0, sys_debug_rect, Comp.RECT, Comp.COLOR, has_properties={Prop.DEBUG}, renderer=self.renderer)
-        ecs.run_system(0, sys_debug_line, Comp.LINE, Comp.COLOR, has_properties={Prop.DEBUG}, renderer=self.renderer)
-        ecs.run_system(0, sys_draw_texture, Comp.TEXTURE, Comp.PRSA, has_properties={Prop.DEBUG})
-        non_ecs_sys_debug_prune()
+        with metrics.timed():
+            # Make mouse work even if stackpermissions forbids update
+            profiler.run_system(0, sys_mouse, Comp.PRSA,
+                                mouse_pos=self.app.mouse,
+                                has_properties={Comp.WANTS_MOUSE})
+
+            profiler.run_system(0, sys_texture_from_texture_list, Comp.TEXTURE_LIST)
+            profiler.run_system(0, sys_textblink, Comp.COLOR_CYCLE)
+            # The trails go on top of the ground, but below the cities and ruins
+            ground = cache['textures']['ground']
+            rect = ground.get_rect(midbottom=self.app.logical_rect.midbottom)
+            render_stats.draw(ground, dstrect=rect)
+
+            profiler.call(non_ecs_sys_draw_trails, self.renderer)
+            profiler.call(non_ecs_sys_draw_background, background, self.renderer, self.app.logical_rect.size)
+            profiler.run_system(0, sys_draw_texture, Comp.TEXTURE, Comp.PRSA, exclude=Prop.IS_BACKGROUND)
+            profiler.run_system(0, sys_draw_textlabel, Comp.TEXT, Comp.PRSA, Comp.ANCHOR, Comp.COLOR, exclude=Prop.IS_BACKGROUND)
+
+            # This is for debugging only
+            profiler.run_system(0, sys_debug_rect, Comp.RECT, Comp.COLOR, has_properties={Prop.DEBUG}, renderer=self.renderer)
+            profiler.run_system(0, sys_debug_line, Comp.LINE, Comp.COLOR, has_properties={Prop.DEBUG}, renderer=self.renderer)
+            profiler.run_system(0, sys_draw_texture, Comp.TEXTURE, Comp.PRSA, has_properties={Prop.DEBUG})
+            profiler.call(non_ecs_sys_debug_prune)
+
+        render_stats.end_frame()
+        metrics.end_frame()
 
     def launch_defense(self, launchpad: int, target: Point) -> None:
         if not GS.batteries[launchpad]:
@@ -495,52 +569,61 @@ class Game(GameState):
         dest = vec2(target)
         speed = C.MISSILE_SPEEDS[launchpad]
 
-        target_eid = ecs.create_entity()
+        target_eid = mk_target(None, dest)
 
         def cb_shutdown(eid: EntityID) -> None:
-            ecs.remove_entity(target_eid)
+            entity_pool.retire(target_eid)
 
-        mk_target(target_eid, dest)
         mk_missile(start, dest, speed, cb_shutdown, incoming=False)
         play_sound(cache['sounds']['launch'])
 
     def run_game_systems(self, dt):
-        ecs.run_system(dt, sys_momentum, Comp.PRSA, Comp.MOMENTUM)
-        ecs.run_system(dt, sys_smartbomb_evade, Comp.PRSA, Comp.EVADE_FIX)
-        ecs.run_system(dt, sys_aim, Comp.PRSA, Comp.TARGET, Comp.MOMENTUM, Comp.SPEED, has_properties={Prop.IS_SMARTBOMB})
-        ecs.run_system(dt, sys_dont_overshoot, Comp.PRSA, Comp.MOMENTUM, Comp.TARGET)
-        ecs.run_system(dt, sys_update_trail, Comp.PRSA, Comp.TRAIL)
-        ecs.run_system(dt, sys_target_reached, Comp.PRSA, Comp.TARGET)
-        ecs.run_system(dt, sys_trail, Comp.TRAIL, texture=self.trail_canvas)
-        ecs.run_system(dt, sys_trail_eraser, Comp.TRAIL, texture=self.trail_canvas, has_properties={Prop.IS_DEAD_TRAIL})
-        ecs.run_system(dt, sys_explosion, Comp.TEXTURE_LIST, Comp.PRSA, Comp.SCALE, has_properties={Prop.IS_EXPLOSION})
-        ecs.run_system(dt, sys_container, Comp.PRSA, Comp.CONTAINER)
-        ecs.run_system(dt, sys_lifetime, Comp.LIFETIME)
-        ecs.run_system(dt, sys_close_orphan_sound, Comp.SOUND_CHANNEL, Comp.PARENT_TYPE)
-
+        impact_schedule.advance(dt)
+        if C.MOTION_STORE:
+            # Flyers are the only ones moving without a target
+            profiler.run_system(dt, sys_momentum, Comp.PRSA, Comp.MOMENTUM, has_properties={Prop.IS_FLYER})
+            profiler.call(non_ecs_sys_motion, motion_store, dt)
+        else:
+            profiler.run_system(dt, sys_momentum, Comp.PRSA, Comp.MOMENTUM)
+            profiler.run_system(dt, sys_smartbomb_evade, Comp.PRSA, Comp.EVADE_FIX)
+            profiler.run_system(dt, sys_aim, Comp.PRSA, Comp.TARGET, Comp.MOMENTUM, Comp.SPEED, has_properties={Prop.IS_SMARTBOMB})
+            profiler.run_system(dt, sys_dont_overshoot, Comp.PRSA, Comp.MOMENTUM, Comp.TARGET)
+        profiler.run_system(dt, sys_target_reached, Comp.PRSA, Comp.TARGET)
+        profiler.call(non_ecs_sys_explosions, explosion_registry)
+        profiler.run_system(dt, sys_container, Comp.PRSA, Comp.CONTAINER)
+        profiler.run_system(dt, sys_lifetime, Comp.LIFETIME)
+        profiler.run_system(dt, sys_close_orphan_sound, Comp.SOUND_CHANNEL, Comp.PARENT_TYPE)
+
+        # The collisions sweep missiles from their old trail head and
+        # smartbombs from their previous position to where they are now, so
+        # only move both along afterwards.  The second pass in the update
+        # phases then only tests the current positions against the
+        # explosions detonated in this frame.
         self.do_collisions()
+        profiler.run_system(dt, sys_update_trail, Comp.PRSA, Comp.TRAIL)
+        profiler.run_system(dt, sys_remember_pos, Comp.PRSA, Comp.PREV_POS)
 
-        ecs.run_system(dt, sys_detonate_flyer, Comp.PRSA, has_properties={Prop.IS_FLYER, Prop.IS_DEAD})
-        ecs.run_system(dt, sys_detonate_missile, Comp.PRSA, Comp.TRAIL, has_properties={Prop.IS_MISSILE, Prop.IS_DEAD})
-        ecs.run_system(dt, sys_detonate_smartbomb, Comp.PRSA, has_properties={Prop.IS_SMARTBOMB, Prop.IS_DEAD})
+        profiler.run_system(dt, sys_detonate_flyer, Comp.PRSA, has_properties={Prop.IS_FLYER, Prop.IS_DEAD})
+        profiler.run_system(dt, sys_detonate_missile, Comp.PRSA, has_properties={Prop.IS_MISSILE, Prop.IS_DEAD})
+        profiler.run_system(dt, sys_detonate_smartbomb, Comp.PRSA, has_properties={Prop.IS_SMARTBOMB, Prop.IS_DEAD})
 
         # Shutdown needs to be very last, else all the IS_DEAD filters won't trigger
-        ecs.run_system(dt, sys_shutdown, Comp.SHUTDOWN, has_properties={Prop.IS_DEAD})
+        profiler.run_system(dt, sys_shutdown, Comp.SHUTDOWN, has_properties={Prop.IS_DEAD})
 
-        non_ecs_sys_prune()
+        profiler.call(non_ecs_sys_prune)
 
     def do_collisions(self) -> None:
-        non_ecs_sys_collide_flyer_with_explosion()
-        non_ecs_sys_collide_missile_with_battery()
-        non_ecs_sys_collide_missile_with_city()
-        non_ecs_sys_collide_missile_with_explosion()
-        non_ecs_sys_collide_smartbomb_with_battery()
-        non_ecs_sys_collide_smartbomb_with_city()
-        non_ecs_sys_collide_smartbomb_with_explosion()
-
-        ecs.add_component(EIDs.SCORE, Comp.TEXT, f'{GS.score:5d}  ')
-        if GS.score > highscoretable.leader.score:
-            ecs.add_component(EIDs.HIGHSCORE, Comp.TEXT, f'{GS.score:5d}')
+        profiler.call(non_ecs_sys_update_broadphase, self.broadphase)
+
+        # First collect all contacts, then apply them in one go
+        contacts = []
+        profiler.call(non_ecs_sys_collide_flyer_with_explosion, self.broadphase, contacts)
+        profiler.call(non_ecs_sys_collide_missile_with_ground, self.broadphase, contacts)
+        profiler.call(non_ecs_sys_collide_missile_with_explosion, self.broadphase, contacts)
+        profiler.call(non_ecs_sys_collide_smartbomb_with_ground, self.broadphase, contacts)
+        profiler.call(non_ecs_sys_collide_smartbomb_with_explosion, self.broadphase, contacts)
+
+        profiler.call(non_ecs_sys_resolve_contacts, contacts)
 
     def teardown(self):
         stop_all_sounds()
@@ -11,9 +11,11 @@ from pgcooldown import Cooldown
 
 import missilecommand.config as C
 
+from missilecommand.background import background
 from missilecommand.gamestate import gs as GS
 from missilecommand.highscoretable import highscoretable
 from missilecommand.launchers import mk_textlabel
+from missilecommand.tracer import tracer
 from missilecommand.types import Comp, EIDs, Prop
 from missilecommand.utils import play_sound
 
@@ -46,7 +48,7 @@ class Debriefing(GameState):
             StatePhase.LINGER_POST: self.phase_linger_post_update,
         }
 
-        self.phase_walker = state_machine.walker()
+        self.phase_walker = tracer.walker('Debriefing', state_machine.walker())
         self.phase = next(self.phase_walker)
 
         self.it_missiles = iter(list(chain(*(b for b in GS.batteries))))
@@ -97,10 +99,8 @@ class Debriefing(GameState):
             self.phase = next(self.phase_walker)
             self.cd_count.reset()
         else:
-            prev_score = GS.score // C.BONUS_CITY_SCORE
-
             self.missile_score += GS.score_mult * C.Score.UNUSED_MISSILE
-            GS.score += GS.score_mult * C.Score.UNUSED_MISSILE
+            new_bonus_cities = GS.add_score(GS.score_mult * C.Score.UNUSED_MISSILE)
             ecs.add_component(EIDs.MISSILES_LABEL, Comp.TEXT, str(self.missile_score))
             ecs.add_component(EIDs.SCORE, Comp.TEXT, f'{GS.score:5d}  ')
 
@@ -114,15 +114,12 @@ class Debriefing(GameState):
             play_sound(cache['sounds']['silo-count'])
             self.cd_count.reset()
 
-            if GS.score // C.BONUS_CITY_SCORE > prev_score:
-                GS.bonus_cities += 1
+            if new_bonus_cities:
                 play_sound(cache['sounds']['bonus-city'])
 
     def phase_cities_update(self, dt):
         if not self.cd_count.cold(): return
 
-        score_pre = GS.score // C.BONUS_CITY_SCORE
-
         try:
             eid = next(self.it_city_eids)
         except StopIteration:
@@ -130,7 +127,8 @@ class Debriefing(GameState):
             self.cd_linger_post.reset()
         else:
             self.city_score += GS.score_mult * C.Score.CITY
-            GS.score += GS.score_mult * C.Score.CITY
+            if GS.add_score(GS.score_mult * C.Score.CITY):
+                play_sound(cache['sounds']['bonus-city'])
             ecs.add_component(EIDs.CITIES_LABEL, Comp.TEXT, str(self.city_score))
             ecs.add_component(EIDs.SCORE, Comp.TEXT, f'{GS.score:5d}  ')
             if GS.score > highscoretable.leader.score:
@@ -140,14 +138,10 @@ class Debriefing(GameState):
             prsa.pos = self.city_list_pos.copy()
             self.city_list_pos.x += C.SPRITESHEET['small-cities'][0].width * 1.2
             ecs.add_component(eid, Comp.ANCHOR, 'midleft')
+            background.invalidate()
             play_sound(cache['sounds']['silo-count'])
             self.cd_count.reset(0.275)
 
-        new_bonus_cities = GS.score // C.BONUS_CITY_SCORE - score_pre
-        if new_bonus_cities > 0:
-            GS.bonus_cities += new_bonus_cities
-            play_sound(cache['sounds']['bonus-city'])
-
     def phase_linger_post_update(self, dt):
         if not self.cd_linger_post.cold(): return
         self.teardown()
@@ -4,13 +4,15 @@ from collections.abc import MutableSet
 class Incoming(MutableSet):
     def __init__(self, slots, iterable=None):
         self.slots = slots
+        # A dict instead of a set keeps insertion order, so iterating doesn't
+        # depend on the hashes of the random entity ids.
         if iterable is None:
-            self.data = set()
+            self.data = {}
         else:
-            self.data = set(iterable)
+            self.data = dict.fromkeys(iterable)
 
     def __repr__(self):
-        return self.data.__repr__()
+        return set(self.data).__repr__()
 
     def __contains__(self, item):
         return item in self.data
@@ -25,10 +27,10 @@ class Incoming(MutableSet):
         if self.slots and len(self) >= self.slots:
             raise ValueError(f'Maximum number of entries: {self.slots}')
 
-        self.data.add(item)
+        self.data[item] = None
 
     def discard(self, item):
-        self.data.discard(item)
+        self.data.pop(item, None)
 
     def free_slots(self):
         return self.slots - len(self)
@@ -15,9 +15,11 @@ from rpeasings import in_quad
 import missilecommand.config as C
 
 from missilecommand.launchers import mk_gameover_explosion, mk_gameover_text
+from missilecommand.renderstats import render_stats
 from missilecommand.systems import (sys_apply_scale, sys_colorcycle,
                                     sys_colorize, sys_textcurtain,
                                     sys_draw_textlabel, sys_draw_texture)
+from missilecommand.tracer import tracer
 from missilecommand.types import Comp, Prop
 from missilecommand.utils import play_sound, purge_entities
 
@@ -71,7 +73,7 @@ class Gameover(GameState):
     def reset(self, *args: Any, **kwargs: Any) -> None:
         ecs.reset()
 
-        self.phase_walker = self.sm.walker()
+        self.phase_walker = tracer.walker('Gameover', self.sm.walker())
         self.phase = next(self.phase_walker)
 
     def restart(self, from_state: 'GameState', result: Any) -> None:
@@ -135,8 +137,8 @@ class Gameover(GameState):
             raise StateExit
 
     def draw(self) -> None:
-        self.app.renderer.draw_color = C.COLOR.gameover
-        self.app.renderer.clear()
+        render_stats.set_color(self.app.renderer, C.COLOR.gameover)
+        render_stats.clear(self.app.renderer)
 
         ecs.run_system(0, sys_draw_texture, Comp.TEXTURE, Comp.PRSA)
         ecs.run_system(0, sys_draw_textlabel, Comp.TEXT, Comp.PRSA, Comp.ANCHOR, Comp.COLOR)
@@ -1,3 +1,6 @@
+import missilecommand.config as C
+
+
 class GameState:
     def __init__(self):
         self.score = 0
@@ -10,5 +13,13 @@ class GameState:
 
     reset = __init__
 
+    def add_score(self, points: int) -> int:
+        """Add points to the score, return the number of new bonus cities."""
+        new_bonus_cities = (self.score + points) // C.BONUS_CITY_SCORE - self.score // C.BONUS_CITY_SCORE
+        self.score += points
+        self.bonus_cities += new_bonus_cities
+
+        return new_bonus_cities
+
 
 gs = GameState()
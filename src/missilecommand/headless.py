@@ -0,0 +1,320 @@
+"""Run the game without window, audio or wall clock.
+
+The headless runner drives a `Game` state with a fixed timestep as fast as
+the CPU allows.  This is meant for balancing and regression runs, not for
+playing.
+
+Since `pgcooldown.Cooldown` reads the wall clock, all cooldowns and
+`LerpThing`s would run out in real time while the simulation races ahead.
+`install_sim_clock` replaces the `Cooldown` class with `SimCooldown`, which
+reads the simulated `sim_clock` instead.  This must happen before the first
+game object is created.
+"""
+
+import sys
+
+from random import seed as random_seed
+from time import perf_counter
+
+import pygame
+import pygame._sdl2 as sdl2
+import pgcooldown
+import tinyecs as ecs
+
+from ddframework.app import GameState, StateExit
+from ddframework.cache import cache
+from pygame.math import Vector2 as vec2
+from pygame.typing import Point
+
+import missilecommand.config as C
+
+from missilecommand.game import StatePhase
+from missilecommand.gamestate import gs as GS
+from missilecommand.pool import entity_pool
+from missilecommand.types import Comp, Prop
+
+_WallClockCooldown = pgcooldown.Cooldown
+
+
+class SimClock:
+    """A clock that only moves when told so."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def advance(self, dt: float) -> None:
+        self.now += dt
+
+
+sim_clock = SimClock()
+
+
+class SimCooldown:
+    """Drop-in replacement for `pgcooldown.Cooldown` running on `sim_clock`.
+
+    Only the interface of `Cooldown` is replicated, see its documentation for
+    details.
+    """
+
+    def __init__(self, duration: float = 0, cold: bool = False,
+                 paused: bool = False, wrap: bool = False) -> None:
+        self._paused = False
+        self._frozen = 0.0
+
+        if isinstance(duration, (SimCooldown, _WallClockCooldown)):
+            other = duration
+            self.duration = other.duration
+            self.wrap = other.wrap
+            self._t0 = sim_clock.now
+            self.temperature = other.temperature
+            if other.paused:
+                self.pause()
+            return
+
+        self.duration = float(duration)
+        self.wrap = wrap
+        self._t0 = sim_clock.now
+
+        if cold:
+            self.temperature = 0
+        if paused:
+            self.pause()
+
+    def __repr__(self) -> str:
+        return f'SimCooldown({self.duration}, wrap={self.wrap}, paused={self.paused}) at {hex(id(self))}'
+
+    @property
+    def temperature(self) -> float:
+        if self._paused:
+            return self._frozen
+        return self.duration - (sim_clock.now - self._t0)
+
+    @temperature.setter
+    def temperature(self, value: float) -> None:
+        if self._paused:
+            self._frozen = value
+        else:
+            self._t0 = sim_clock.now - (self.duration - value)
+
+    @property
+    def remaining(self) -> float:
+        return max(self.temperature, 0.0)
+
+    @remaining.setter
+    def remaining(self, value: float) -> None:
+        self.temperature = value
+
+    @property
+    def normalized(self) -> float:
+        if not self.duration:
+            return 0.0
+        return min(max(1 - self.temperature / self.duration, 0.0), 1.0)
+
+    @normalized.setter
+    def normalized(self, value: float) -> None:
+        self.temperature = self.duration * (1 - value)
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @paused.setter
+    def paused(self, value: bool) -> None:
+        if value:
+            self.pause()
+        else:
+            self.start()
+
+    def cold(self) -> bool:
+        return self.temperature <= 0
+
+    def hot(self) -> bool:
+        return not self.cold()
+
+    def is_paused(self) -> bool:
+        return self._paused
+
+    def pause(self) -> None:
+        if self._paused: return
+        self._frozen = self.temperature
+        self._paused = True
+
+    def start(self) -> None:
+        if not self._paused: return
+        self._paused = False
+        self.temperature = self._frozen
+
+    def reset(self, new: float = 0, wrap: bool | None = None) -> None:
+        wrap = self.wrap if wrap is None else wrap
+        overshoot = self.temperature
+
+        if new:
+            self.duration = float(new)
+
+        self.temperature = self.duration + overshoot if wrap else self.duration
+
+    def set_cold(self) -> None:
+        self.temperature = 0
+
+    def set_to(self, t: float = 0) -> None:
+        self.temperature = t
+
+    def __call__(self, *args, **kwargs) -> float: return self.temperature  # noqa: E704
+    def __bool__(self) -> bool: return self.hot()  # noqa: E704
+    def __float__(self) -> float: return float(self.temperature)  # noqa: E704
+    def __int__(self) -> int: return int(self.temperature)  # noqa: E704
+    def __lt__(self, other: object) -> bool: return self.temperature < float(other)  # noqa: E704
+    def __le__(self, other: object) -> bool: return self.temperature <= float(other)  # noqa: E704
+    def __eq__(self, other: object) -> bool: return self.temperature == float(other)  # noqa: E704
+    def __ne__(self, other: object) -> bool: return self.temperature != float(other)  # noqa: E704
+    def __ge__(self, other: object) -> bool: return self.temperature >= float(other)  # noqa: E704
+    def __gt__(self, other: object) -> bool: return self.temperature > float(other)  # noqa: E704
+    __hash__ = object.__hash__
+
+    def __iter__(self):
+        while self.hot():
+            yield self.remaining
+
+
+def install_sim_clock() -> None:
+    """Make every `Cooldown` and `LerpThing` run on `sim_clock`.
+
+    `LerpThing` looks up `Cooldown` in the `pgcooldown` module, all other
+    users imported the name themselves, so rebind it wherever it was imported.
+    """
+    pgcooldown.Cooldown = SimCooldown
+    for module in list(sys.modules.values()):
+        if getattr(module, 'Cooldown', None) is _WallClockCooldown:
+            module.Cooldown = SimCooldown
+
+
+class HeadlessApp:
+    """Stand-in for `ddframework.app.App` with a fixed timestep.
+
+    Only the parts of the `App` interface the game states use are
+    implemented.  The window is created on the SDL dummy driver, so the
+    `Game` can still allocate its render target textures.
+    """
+
+    def __init__(self, title: str, resolution: tuple[int, int], dt: float) -> None:
+        self.title = title
+        self.dt = dt
+        self.window = pygame.Window(title, size=resolution)
+        self.renderer = sdl2.Renderer(self.window)
+        self.renderer.logical_size = resolution
+        self.logical_rect = pygame.Rect((0, 0), resolution)
+        self.clock = pygame.time.Clock()
+        self.mouse = self.logical_rect.center
+        self.stack = []
+        self.ticks = 0
+
+    def coordinates_to_window(self, pos: Point) -> Point:
+        return pos
+
+    def size_to_window(self, size: Point) -> Point:
+        return size
+
+    def is_stacked(self, state: GameState) -> bool:
+        return bool(self.stack) and self.stack[-1] is not state
+
+    def push(self, state: GameState, passthrough: object = None) -> None:
+        self.stack.append(state)
+        state.reset()
+
+    def step(self) -> bool:
+        """Advance the top of the state stack by one tick.
+
+        Returns False once the stack is empty.
+        """
+        if not self.stack:
+            return False
+
+        sim_clock.advance(self.dt)
+        self.clock.tick()
+        self.ticks += 1
+
+        state = self.stack[-1]
+        try:
+            state.update(self.dt)
+        except StateExit as e:
+            self.stack.pop()
+            if self.stack:
+                self.stack[-1].restart(state, e.args[0] if e.args else None)
+
+        return bool(self.stack)
+
+
+class Autopilot:
+    """Simple deterministic player, so waves don't end with zero score.
+
+    Fires one defense per tick at the lead position of the lowest incoming
+    missile not yet engaged, using the nearest battery with ammo left.
+    """
+
+    def __init__(self, game: GameState) -> None:
+        self.game = game
+        self.engaged = set()
+
+    def __call__(self) -> None:
+        incoming = [(eid, prsa, momentum)
+                    for eid, (prsa, momentum) in ecs.eids_by_cids(Comp.PRSA, Comp.MOMENTUM,
+                                                                  has_properties={Prop.IS_INCOMING})
+                    if eid not in self.engaged and C.CROSSHAIR_CONSTRAINT.collidepoint(prsa.pos)]
+        self.engaged &= set(ecs.eidx)
+        if not incoming:
+            return
+
+        eid, prsa, momentum = max(incoming, key=lambda m: m[1].pos.y)
+        batteries = [i for i, b in enumerate(GS.batteries) if b]
+        if not batteries:
+            return
+
+        launchpad = min(batteries, key=lambda i: abs(C.POS_BATTERIES[i].x - prsa.pos.x))
+        start = C.POS_BATTERIES[launchpad]
+        speed = C.MISSILE_SPEEDS[launchpad]
+
+        aim = vec2(prsa.pos)
+        for _ in range(3):
+            aim = prsa.pos + momentum * (start.distance_to(aim) / speed)
+
+        aim.x = pygame.math.clamp(aim.x, C.CROSSHAIR_CONSTRAINT.left, C.CROSSHAIR_CONSTRAINT.right - 1)
+        aim.y = pygame.math.clamp(aim.y, C.CROSSHAIR_CONSTRAINT.top, C.CROSSHAIR_CONSTRAINT.bottom - 1)
+
+        self.game.launch_defense(launchpad, aim)
+        self.engaged.add(eid)
+
+
+def run(app: HeadlessApp, game: GameState, waves: int, seed: int | None = None) -> dict[str, float]:
+    """Play `waves` waves of `game` and return the run statistics.
+
+    If the game warps to a later wave, the waves are counted from there.
+    """
+    app.push(game)
+    if seed is not None:
+        random_seed(seed)
+
+    autopilot = Autopilot(game)
+    first = game.warp.wave if game.warp is not None else 0
+
+    t0 = perf_counter()
+    while game.level < first + waves:
+        if game.phase == StatePhase.PLAYING and not app.is_stacked(game):
+            autopilot()
+
+        if not app.step():
+            break
+    wall = perf_counter() - t0
+
+    return {
+        'waves': min(game.level + 1 - first, waves),
+        'ticks': app.ticks,
+        'sim_time': sim_clock.now,
+        'wall_time': wall,
+        'tps': app.ticks / wall if wall else 0.0,
+        'score': GS.score,
+        'mask_cache_hits': cache['scaled-masks']['explosions'].hits,
+        'mask_cache_misses': cache['scaled-masks']['explosions'].misses,
+        'pool_hits': entity_pool.hits,
+        'pool_misses': entity_pool.misses,
+        'pool_hit_rate': entity_pool.hit_rate,
+    }
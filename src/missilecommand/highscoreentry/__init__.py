@@ -12,6 +12,7 @@ import missilecommand.config as C
 from missilecommand.gamestate import gs as GS
 from missilecommand.highscoretable import highscoretable, HighscoreRecord
 from missilecommand.launchers import mk_textlabel, mk_texture
+from missilecommand.renderstats import render_stats
 from missilecommand.systems import sys_draw_texture, sys_draw_textlabel
 from missilecommand.types import Comp
 from missilecommand.utils import check_for_exit, play_sound
@@ -81,8 +82,8 @@ class HighscoreEntry(GameState):
         ecs.add_component('entry', Comp.TEXT, ''.join(self.entry))
 
     def draw(self) -> None:
-        self.app.renderer.draw_color = C.COLOR.background
-        self.app.renderer.clear()
+        render_stats.set_color(self.app.renderer, C.COLOR.background)
+        render_stats.clear(self.app.renderer)
         ecs.run_system(0, sys_draw_textlabel, Comp.TEXT, Comp.PRSA, Comp.ANCHOR, Comp.COLOR)
         ecs.run_system(0, sys_draw_texture, Comp.TEXTURE, Comp.PRSA)
 
@@ -12,11 +12,14 @@ from ddframework.dynamicsprite import PRSA
 
 import missilecommand.config as C
 
+from missilecommand.background import background
 from missilecommand.highscoretable import highscoretable
 from missilecommand.launchers import mk_battery, mk_city, mk_textlabel, mk_texture
-from missilecommand.systems import (sys_draw_texture, sys_draw_textlabel, sys_textblink,
+from missilecommand.renderstats import render_stats
+from missilecommand.systems import (non_ecs_sys_draw_background,
+                                    sys_draw_texture, sys_draw_textlabel, sys_textblink,
                                     sys_texture_from_texture_list)
-from missilecommand.types import Comp
+from missilecommand.types import Comp, Prop
 from missilecommand.utils import check_for_exit
 
 THIS = 'highscores'
@@ -34,8 +37,12 @@ class Highscores(GameState):
             ecs.set_property(eid, THIS)
             return eid
 
+        def tag_background(eid):
+            ecs.set_property(eid, Prop.IS_BACKGROUND)
+            return tag_entity(eid)
+
         for msg in C.MESSAGES[THIS].values():
-            tag_entity(mk_textlabel(*msg))
+            tag_background(mk_textlabel(*msg))
 
         for t in {'DEFEND', 'CITIES', '↓ DEFEND', '↓ CITIES'}:
             tag_entity(mk_textlabel(*C.MESSAGES['briefing'][t]))
@@ -48,9 +55,9 @@ class Highscores(GameState):
         for y, (score, initials) in enumerate(nlargest(len(highscoretable), highscoretable)):
             msg = C.MessageConfig(f'{initials} {score:8}',
                                   C.GRID(15, y + 4, 2, 1).center, 'center', C.COLOR.special_text)
-            tag_entity(mk_textlabel(*msg))
+            tag_background(mk_textlabel(*msg))
 
-        eid = tag_entity(mk_texture(cache['textures']['ground'], PRSA(pos=C.GRID.midbottom), 'midbottom'))
+        eid = tag_background(mk_texture(cache['textures']['ground'], PRSA(pos=C.GRID.midbottom), 'midbottom'))
         ecs.set_property(eid, THIS)
 
         for pos in C.POS_CITIES:
@@ -62,6 +69,8 @@ class Highscores(GameState):
             for silo in silos:
                 ecs.set_property(silo, THIS)
 
+        background.invalidate()
+
         self.cd_state = Cooldown(5)
 
     def restart(self, from_state: 'GameState', result: Any) -> None:
@@ -80,12 +89,13 @@ class Highscores(GameState):
             raise StateExit
 
     def draw(self) -> None:
-        self.app.renderer.draw_color = C.COLOR.background
-        self.app.renderer.clear()
+        render_stats.set_color(self.app.renderer, C.COLOR.background)
+        render_stats.clear(self.app.renderer)
         ecs.run_system(0, sys_textblink, Comp.COLOR_CYCLE)
-        ecs.run_system(0, sys_draw_textlabel, Comp.TEXT, Comp.PRSA, Comp.ANCHOR, Comp.COLOR)
         ecs.run_system(0, sys_texture_from_texture_list, Comp.TEXTURE_LIST)
-        ecs.run_system(0, sys_draw_texture, Comp.TEXTURE, Comp.PRSA)
+        non_ecs_sys_draw_background(background, self.app.renderer, self.app.logical_rect.size)
+        ecs.run_system(0, sys_draw_textlabel, Comp.TEXT, Comp.PRSA, Comp.ANCHOR, Comp.COLOR, exclude=Prop.IS_BACKGROUND)
+        ecs.run_system(0, sys_draw_texture, Comp.TEXTURE, Comp.PRSA, exclude=Prop.IS_BACKGROUND)
 
     def teardown(self) -> None:
         ecs.purge_by_property(THIS)
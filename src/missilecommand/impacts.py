@@ -0,0 +1,125 @@
+import heapq
+
+from itertools import count
+
+from pygame.math import Vector2 as vec2
+
+import missilecommand.config as C
+
+from missilecommand.types import EntityID
+
+# Everything an incoming missile can crash into, in the order the collision
+# systems checked them before.
+GROUND = ([('city', i, hitbox) for i, hitbox in enumerate(C.HITBOX_CITY)]
+          + [('battery', i, hitbox) for i, hitbox in enumerate(C.HITBOX_BATTERIES)])
+
+
+def first_contact(start: vec2, dest: vec2) -> tuple[float, str, int] | None:
+    """Distance along the line to the first ground hitbox entered, or None.
+
+    The result is (distance, kind, index) with kind being 'city' or
+    'battery'.
+    """
+    path = dest - start
+    length = path.length()
+    if not length:
+        return None
+
+    direction = path / length
+    best = None
+    for kind, i, hitbox in GROUND:
+        t0, t1 = 0.0, length
+        for p, d, lo, hi in ((start.x, direction.x, hitbox.left, hitbox.right),
+                             (start.y, direction.y, hitbox.top, hitbox.bottom)):
+            if d == 0:
+                if not lo <= p < hi:
+                    break
+                continue
+
+            a, b = (lo - p) / d, (hi - p) / d
+            if a > b:
+                a, b = b, a
+            t0, t1 = max(t0, a), min(t1, b)
+            if t0 > t1:
+                break
+        else:
+            if best is None or t0 < best[0]:
+                best = (t0, kind, i)
+
+    return best
+
+
+class ImpactSchedule:
+    """Time ordered queue of incoming missiles hitting the ground.
+
+    Incoming missiles fly a straight line at constant speed, so when they
+    will enter a city or battery hitbox is known at launch.  `mk_missile`
+    schedules that moment on the game clock, `advance` moves the clock along
+    with the motion systems and collects everything due into `due`, where
+    the collision systems pick it up.
+
+    A missile destroyed before it arrives needs to be `cancel`ed.  Since
+    the entity pool reuses IDs, every entry is tagged with a sequence number
+    and only counts if it's still the pending one of its missile.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.heap = []
+        self.pending = {}
+        self.due = {'city': [], 'battery': []}
+        self.seq = count()
+
+    def __repr__(self) -> str:
+        return f'ImpactSchedule(now={self.now:.3f}, pending={len(self.pending)})'
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def clear(self) -> None:
+        self.heap.clear()
+        self.pending.clear()
+        for entries in self.due.values():
+            entries.clear()
+
+    def add(self, eid: EntityID, start: vec2, dest: vec2, speed: float) -> None:
+        self.pending.pop(eid, None)
+
+        contact = first_contact(start, dest)
+        if contact is None or not speed:
+            return
+
+        distance, kind, i = contact
+        seq = next(self.seq)
+        self.pending[eid] = seq
+        heapq.heappush(self.heap, (self.now + distance / speed, seq, eid, kind, i))
+
+    def cancel(self, eid: EntityID) -> None:
+        self.pending.pop(eid, None)
+
+    def speed_up(self, factor: float) -> None:
+        """All pending missiles were made factor times faster."""
+        self.heap = [(self.now + (due - self.now) / factor, *rest) for due, *rest in self.heap]
+        heapq.heapify(self.heap)
+
+    def advance(self, dt: float) -> None:
+        self.now += dt
+
+        # Slack for the rounding of the summed up frame times
+        heap = self.heap
+        while heap and heap[0][0] <= self.now + 1e-9:
+            _, seq, eid, kind, i = heapq.heappop(heap)
+            if self.pending.get(eid) != seq:
+                continue
+
+            del self.pending[eid]
+            self.due[kind].append((eid, i))
+
+    def take(self, kind: str) -> list[tuple[EntityID, int]]:
+        """Return and forget all due impacts of kind as (eid, index)."""
+        entries = self.due[kind]
+        self.due[kind] = []
+        return entries
+
+
+impact_schedule = ImpactSchedule()
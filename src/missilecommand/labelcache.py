@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+import pygame
+import pygame._sdl2 as sdl2
+
+from ddframework.cache import cache
+from pygame.typing import ColorLike
+
+import missilecommand.config as C
+
+from missilecommand.renderstats import render_stats
+
+
+def draw_glyphs(text: str, glyph: pygame.Rect, color: ColorLike) -> None:
+    """Draw text glyph by glyph, starting with the first glyph at `glyph`.
+
+    This bypasses the label cache, use it for text that changes constantly.
+    """
+    font = cache['textures']['letters']
+    color = pygame.Color(color)
+    crect = glyph.copy()
+    for c in text:
+        letter = font[C.CHAR_MAP[c]]
+        bkp_color = letter.color
+        letter.color = color
+        render_stats.draw(letter, dstrect=crect)
+        letter.color = bkp_color
+        crect.x += crect.width
+
+
+class LabelCache:
+    """LRU cache of pre-rendered text labels.
+
+    Drawing a label glyph by glyph costs one draw call per character, plus
+    the color and alpha changes on the shared letter textures.  This cache
+    renders a label once into its own texture, keyed by text, color and
+    glyph size, so it can be drawn with a single call afterwards.
+
+    At most `maxsize` labels are kept, the least recently used one is dropped
+    first.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError('LabelCache needs room for at least 1 label')
+
+        self.maxsize = maxsize
+        self.labels = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __repr__(self) -> str:
+        return f'LabelCache({self.maxsize}, size={len(self)}, hits={self.hits}, misses={self.misses})'
+
+    def clear(self) -> None:
+        self.labels.clear()
+
+    def get(self, text: str, color: ColorLike, scale: float | tuple[float, float]) -> sdl2.Texture:
+        """Return the texture of text rendered in color at scale."""
+        glyph = cache['textures']['letters'][0].get_rect().scale_by(scale)
+        color = pygame.Color(color)
+        key = (text, tuple(color), glyph.size)
+
+        try:
+            texture = self.labels[key]
+        except KeyError:
+            self.misses += 1
+            texture = self.labels[key] = self.render(text, color, glyph)
+            if len(self.labels) > self.maxsize:
+                self.labels.popitem(last=False)
+        else:
+            self.hits += 1
+            self.labels.move_to_end(key)
+
+        return texture
+
+    @staticmethod
+    def render(text: str, color: pygame.Color, glyph: pygame.Rect) -> sdl2.Texture:
+        """Render text glyph by glyph into a new texture."""
+        renderer = cache['textures']['letters'][0].renderer
+
+        texture = sdl2.Texture(renderer, (glyph.width * len(text), glyph.height), target=True)
+        texture.blend_mode = pygame.BLENDMODE_BLEND
+        texture.alpha = color.a
+
+        bkp_color = renderer.draw_color
+        with render_stats.render_target(renderer, texture):
+            render_stats.set_color(renderer, C.COLOR.clear)
+            render_stats.clear(renderer)
+
+            draw_glyphs(text, glyph.move_to(topleft=(0, 0)), color)
+        render_stats.set_color(renderer, bkp_color)
+
+        return texture
+
+
+label_cache = LabelCache(C.LABEL_CACHE_SIZE)
@@ -18,6 +18,11 @@ from rpeasings import out_quad
 
 import missilecommand.config as C
 
+from missilecommand.background import background
+from missilecommand.explosions import explosion_registry
+from missilecommand.impacts import first_contact, impact_schedule
+from missilecommand.motion import motion_store
+from missilecommand.pool import entity_pool
 from missilecommand.types import Comp, Container, EIDs, EntityID, Momentum, Prop, Trail
 from missilecommand.utils import play_sound
 
@@ -58,8 +63,10 @@ def mk_city(pos: Point, eid: EntityID = None) -> EntityID:
 
     eid = ecs.create_entity(eid)
     ecs.set_property(eid, Prop.IS_CITY)
+    ecs.set_property(eid, Prop.IS_BACKGROUND)
     ecs.add_component(eid, Comp.PRSA, PRSA(vec2(pos)))
     ecs.add_component(eid, Comp.TEXTURE_LIST, auto_sequence)
+    background.invalidate()
 
     return eid
 
@@ -113,27 +120,39 @@ def mk_debug_rect(rect: RectLike, color: ColorLike = 'red') -> EntityID:
 
 
 def mk_explosion(pos: Point) -> EntityID:
-    scale = LerpThing(0.1, 1, C.EXPLOSION_DURATION, repeat=2, loops=2)
-
-    textures = cache['textures']['explosions'].copy()
     mask = cache['masks']['explosions'][0]
 
-    shuffle(textures)
-    auto_sequence = AutoSequence(textures, C.EXPLOSION_DURATION)
+    if pooled := entity_pool.acquire(Prop.IS_EXPLOSION):
+        # The texture order was already shuffled when it was created
+        eid, (prsa, auto_sequence, scale) = pooled
+        prsa.pos = vec2(pos)
+        prsa.scale = C.EXPLOSION_SCALE_RANGE[0]
+        auto_sequence.lt.reset()
+        # Bouncing swaps the end points
+        scale.vt0, scale.vt1 = C.EXPLOSION_SCALE_RANGE
+        scale.reset()
+    else:
+        scale = LerpThing(*C.EXPLOSION_SCALE_RANGE, C.EXPLOSION_DURATION, repeat=2, loops=2)
+
+        textures = cache['textures']['explosions'].copy()
+        shuffle(textures)
+        auto_sequence = AutoSequence(textures, C.EXPLOSION_DURATION)
 
-    prsa = PRSA(vec2(pos), scale=0.1)
+        prsa = PRSA(vec2(pos), scale=C.EXPLOSION_SCALE_RANGE[0])
+        eid = None
 
-    eid = ecs.create_entity()
+    eid = ecs.create_entity(eid)
     ecs.set_property(eid, Prop.IS_EXPLOSION)
     ecs.add_component(eid, Comp.PRSA, prsa)
     ecs.add_component(eid, Comp.TEXTURE_LIST, auto_sequence)
     ecs.add_component(eid, Comp.SCALE, scale)
     ecs.add_component(eid, Comp.MASK, mask)
+    explosion_registry.add(eid, prsa)
 
     return eid
 
 
-def mk_flyer(eid: EntityID, min_height: float, max_height: float, shoot_cooldown: float,
+def mk_flyer(eid: EntityID | None, min_height: float, max_height: float, shoot_cooldown: float,
              container: Container, shutdown_callback: Callable) -> EntityID:
     kind = choice(('alien', 'plane'))
     color = choice(('red', 'green'))
@@ -150,7 +169,7 @@ def mk_flyer(eid: EntityID, min_height: float, max_height: float, shoot_cooldown
         prsa = PRSA(pos=vec2(container.right, height), scale=(-1, 0))
         momentum = -Momentum(speed, 0)
 
-    ecs.create_entity(eid)
+    eid = ecs.create_entity(eid)
     ecs.set_property(eid, Prop.IS_FLYER)
     ecs.set_property(eid, Prop.IS_PLANE if kind == 'plane' else Prop.IS_SATELLITE)
     ecs.add_component(eid, Comp.PRSA, prsa)
@@ -210,28 +229,46 @@ def mk_quickhelp(r: tuple[int, int, int, int] = (15, 15, 2, 1)):
 def mk_missile(start: vec2, dest: vec2, speed: float,
                shutdown_callback: Callable | None = None,
                *, incoming: bool) -> None:
-    textures = cache['textures']['missile-heads']
-    auto_sequence = AutoSequence(textures, 1)
-    trail = [(start, start)]
-
     # Can't happen, smartbombs and missiles are launched off-screen
     try:
-        momentum = (dest - start).normalize() * speed
+        direction = (dest - start).normalize()
     except ValueError:
-        momentum = vec2()
+        direction = vec2()
+
+    if pooled := entity_pool.acquire(Prop.IS_MISSILE):
+        eid, (prsa, auto_sequence, trail, momentum, target) = pooled
+        # Not in place, sys_dont_overshoot might have made pos the target
+        prsa.pos = start.copy()
+        auto_sequence.lt.reset()
+        trail.origin.update(start)
+        trail.head.update(start)
+        momentum.update(direction * speed)
+        target.update(dest)
+    else:
+        textures = cache['textures']['missile-heads']
+        auto_sequence = AutoSequence(textures, 1)
+        trail = Trail(start)
+        prsa = PRSA(start.copy())
+        momentum = direction * speed
+        target = dest.copy()
+        eid = None
 
-    eid = ecs.create_entity()
+    eid = ecs.create_entity(eid)
     ecs.set_property(eid, Prop.IS_MISSILE)
     ecs.set_property(eid, Prop.IS_TRAIL)
     ecs.set_property(eid, Prop.IS_INCOMING if incoming else Prop.IS_DEFENSE)
-    ecs.add_component(eid, Comp.PRSA, PRSA(start.copy()))
+    ecs.add_component(eid, Comp.PRSA, prsa)
     ecs.add_component(eid, Comp.MOMENTUM, momentum)
     ecs.add_component(eid, Comp.SPEED, speed)
     ecs.add_component(eid, Comp.TEXTURE_LIST, auto_sequence)
-    ecs.add_component(eid, Comp.TARGET, dest.copy())
+    ecs.add_component(eid, Comp.TARGET, target)
     ecs.add_component(eid, Comp.TRAIL, trail)
     if shutdown_callback is not None:
         ecs.add_component(eid, Comp.SHUTDOWN, shutdown_callback)
+    if incoming:
+        impact_schedule.add(eid, start, dest, speed)
+    if C.MOTION_STORE:
+        motion_store.add(eid, prsa, momentum, target, speed, aim=False)
 
     return eid
 
@@ -243,8 +280,10 @@ def mk_ruin(pos: Point, eid: EntityID = None) -> EntityID:
 
     eid = ecs.create_entity(eid)
     ecs.set_property(eid, Prop.IS_RUIN)
+    ecs.set_property(eid, Prop.IS_BACKGROUND)
     ecs.add_component(eid, Comp.TEXTURE_LIST, auto_sequence)
     ecs.add_component(eid, Comp.PRSA, PRSA(vec2(pos)))
+    background.invalidate()
 
 
 def mk_score_label(*args: Any, **kwargs: Any) -> EntityID:
@@ -280,15 +319,24 @@ def mk_smartbomb(start: vec2, dest: vec2, speed: float, shutdown_callback: Calla
     except ValueError:
         momentum = vec2()
 
+    prsa = PRSA(start.copy())
+    target = dest.copy()
+
     eid = ecs.create_entity()
     ecs.set_property(eid, Prop.IS_SMARTBOMB)
     ecs.set_property(eid, Prop.IS_INCOMING)
-    ecs.add_component(eid, Comp.PRSA, PRSA(start.copy()))
+    ecs.add_component(eid, Comp.PRSA, prsa)
+    ecs.add_component(eid, Comp.PREV_POS, start.copy())
     ecs.add_component(eid, Comp.MOMENTUM, momentum)
     ecs.add_component(eid, Comp.SPEED, speed)
     ecs.add_component(eid, Comp.TEXTURE, texture)
-    ecs.add_component(eid, Comp.TARGET, dest.copy())
+    ecs.add_component(eid, Comp.TARGET, target)
+    # The hitbox hit first, as long as the smartbomb doesn't need to evade
+    contact = first_contact(start, dest)
+    ecs.add_component(eid, Comp.GROUND_TARGET, contact and contact[1:])
     ecs.add_component(eid, Comp.SHUTDOWN, shutdown_callback)
+    if C.MOTION_STORE:
+        motion_store.add(eid, prsa, momentum, target, speed, aim=True)
 
     mk_sound_singleton(EIDs.SMARTBOMB_SOUND, 'smartbomb', Prop.IS_SMARTBOMB)
 
@@ -309,12 +357,19 @@ def mk_sound_singleton(eid, sound, parent_type):
     return eid
 
 
-def mk_target(eid: EntityID, pos: Point) -> EntityID:
-    textures = cache['textures']['targets']
-    auto_sequence = AutoSequence(textures, 1)
+def mk_target(eid: EntityID | None, pos: Point) -> EntityID:
+    if eid is None and (pooled := entity_pool.acquire(Prop.IS_TARGET)):
+        eid, (prsa, auto_sequence) = pooled
+        prsa.pos = vec2(pos)
+        auto_sequence.lt.reset()
+    else:
+        textures = cache['textures']['targets']
+        auto_sequence = AutoSequence(textures, 1)
+        prsa = PRSA(vec2(pos))
 
+    eid = ecs.create_entity(eid)
     ecs.set_property(eid, Prop.IS_TARGET)
-    ecs.add_component(eid, Comp.PRSA, PRSA(vec2(pos)))
+    ecs.add_component(eid, Comp.PRSA, prsa)
     ecs.add_component(eid, Comp.TEXTURE_LIST, auto_sequence)
 
     return eid
@@ -345,10 +400,3 @@ def mk_texture(texture: sdl2.Texture, prsa: PRSA, anchor: str = 'center', color:
 
     return eid
 
-
-def mk_trail_eraser(trail: Trail) -> None:
-    eid = ecs.create_entity()
-    ecs.set_property(eid, Prop.IS_DEAD_TRAIL)
-    ecs.add_component(eid, Comp.TRAIL, trail)
-
-    return eid
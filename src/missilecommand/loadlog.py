@@ -0,0 +1,105 @@
+"""Frame cost over load.
+
+Meant to be run together with the stress profile (`--stress`) to see where
+the ECS and the collision systems stop scaling.  Every `C.LOAD_LOG_INTERVAL`
+seconds, one CSV row with the mean entity and incoming count and the frame
+cost of that interval is written.  On `stop`, the frame costs are summed up
+per load bucket of `bucket` entities.
+
+The frame cost is the time spent in the frame without the fps limiter, see
+`pygame.time.Clock.get_rawtime`.
+"""
+
+import csv
+
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+import missilecommand.config as C
+
+FIELDS = ('time', 'frames', 'entities', 'incoming', 'mean_ms', 'p95_ms', 'max_ms')
+
+
+class LoadLog:
+    def __init__(self, interval: float = C.LOAD_LOG_INTERVAL, bucket: int = 100) -> None:
+        self.interval = interval
+        self.bucket = bucket
+        self.enabled = False
+        self.file = None
+        self.writer = None
+        self.t0 = 0.0
+        self.next_row = 0.0
+        self.rows = []
+        self.buckets = {}
+
+    def __repr__(self) -> str:
+        return f'LoadLog(enabled={self.enabled}, rows={len(self.rows)}, buckets={len(self.buckets)})'
+
+    def start(self, fname: str | Path) -> None:
+        if self.enabled:
+            return
+
+        self.file = open(fname, 'w', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+        self.writer.writeheader()
+        self.t0 = perf_counter()
+        self.next_row = self.t0 + self.interval
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Write the last row, close the log and print the summary."""
+        if not self.enabled:
+            return
+
+        self.write_row(perf_counter())
+        self.enabled = False
+        self.file.close()
+        self.file = self.writer = None
+
+        print(self.summary())
+
+    def update(self, frame_ms: float, entities: int, incoming: int) -> None:
+        if not self.enabled:
+            return
+
+        self.rows.append((frame_ms, entities, incoming))
+        self.buckets.setdefault(entities // self.bucket, []).append(frame_ms)
+
+        now = perf_counter()
+        if now >= self.next_row:
+            self.next_row = now + self.interval
+            self.write_row(now)
+
+    def write_row(self, now: float) -> None:
+        if not self.rows:
+            return
+
+        data = np.array(self.rows, dtype=float)
+        self.rows.clear()
+        self.writer.writerow({
+            'time': round(now - self.t0, 3),
+            'frames': len(data),
+            'entities': round(data[:, 1].mean()),
+            'incoming': round(data[:, 2].mean()),
+            'mean_ms': round(data[:, 0].mean(), 3),
+            'p95_ms': round(np.percentile(data[:, 0], 95), 3),
+            'max_ms': round(data[:, 0].max(), 3),
+        })
+        self.file.flush()
+
+    def summary(self) -> str:
+        """Frame cost per load bucket, relative to the frame budget."""
+        budget = 1000 / C.FPS
+        lines = [f'{"entities":>12s} {"frames":>8s} {"mean_ms":>9s} {"p95_ms":>9s} {"budget":>7s}']
+        for bucket, samples in sorted(self.buckets.items()):
+            ms = np.array(samples)
+            lo = bucket * self.bucket
+            lines.append(f'{f"{lo}-{lo + self.bucket - 1}":>12s} {len(ms):8d} {ms.mean():9.3f} '
+                         f'{np.percentile(ms, 95):9.3f} {ms.mean() / budget:7.0%}')
+
+        return '\n'.join(lines)
+
+
+load_log = LoadLog()
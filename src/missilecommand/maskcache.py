@@ -0,0 +1,45 @@
+import pygame
+
+from pygame.math import Vector2 as vec2
+
+
+class ScaledMaskCache:
+    """Precomputed scaled versions of a mask.
+
+    `Mask.scale` allocates a new mask on every call.  For masks that are
+    scaled by a lerp every frame (explosions), this table holds `steps`
+    masks evenly spaced between `lo` and `hi` and returns the one nearest to
+    the requested scale.
+
+    Scales outside of `lo` and `hi` are scaled on the fly and counted as a
+    miss.
+    """
+
+    def __init__(self, mask: pygame.mask.Mask, lo: float, hi: float, steps: int) -> None:
+        if steps < 2:
+            raise ValueError('ScaledMaskCache needs at least 2 steps')
+
+        self.mask = mask
+        self.lo = lo
+        self.hi = hi
+        self.steps = steps
+
+        size = vec2(mask.get_size())
+        step = (hi - lo) / (steps - 1)
+        self.table = [mask.scale(size * (lo + i * step)) for i in range(steps)]
+
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return f'ScaledMaskCache({self.lo}, {self.hi}, steps={self.steps}, hits={self.hits}, misses={self.misses})'
+
+    def get(self, scale: float) -> pygame.mask.Mask:
+        """Return the cached mask nearest to scale."""
+        if not self.lo <= scale <= self.hi:
+            self.misses += 1
+            return self.mask.scale(vec2(self.mask.get_size()) * scale)
+
+        self.hits += 1
+        idx = round((scale - self.lo) / (self.hi - self.lo) * (self.steps - 1))
+        return self.table[idx]
@@ -0,0 +1,181 @@
+"""Live metrics served over HTTP on localhost.
+
+The game thread feeds `metrics.update` once per frame.  The time spent in
+the `timed` blocks of a frame, i.e. the update and draw work without the
+frame limiter sleep, goes into a histogram on `end_frame`.  Everything else
+is collected into a snapshot every `C.METRICS_INTERVAL` seconds.  A background thread serves the latest
+snapshot:
+
+    /metrics  Prometheus text format
+    /json     The snapshot as JSON
+"""
+
+import json
+import threading
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Any
+
+import tinyecs as ecs
+
+import missilecommand.config as C
+
+from missilecommand.profiler import profiler
+from missilecommand.renderstats import KINDS, render_stats
+from missilecommand.types import Prop
+
+PREFIX = 'missilecommand'
+
+
+class Metrics:
+    def __init__(self, interval: float = C.METRICS_INTERVAL,
+                 buckets: tuple[float, ...] = C.METRICS_FRAME_BUCKETS) -> None:
+        self.interval = interval
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.frames = 0
+        self.frame_time = 0.0
+        self.work = 0.0
+        self.next_publish = 0.0
+        self.snapshot = {}
+
+        self.enabled = False
+        self.server = None
+        self.thread = None
+
+    def __repr__(self) -> str:
+        address = self.server.server_address if self.server else None
+        return f'Metrics(enabled={self.enabled}, address={address}, frames={self.frames})'
+
+    def start(self, port: int, host: str = 'localhost') -> None:
+        if self.enabled:
+            return
+
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.metrics = self
+        self.thread = threading.Thread(target=self.server.serve_forever, name='metrics', daemon=True)
+        self.thread.start()
+        self.enabled = True
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+
+        self.enabled = False
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.server = self.thread = None
+
+    @contextmanager
+    def timed(self):
+        """Add the time spent in the block to the cost of this frame."""
+        if not self.enabled:
+            yield
+            return
+
+        t0 = perf_counter()
+        try:
+            yield
+        finally:
+            self.work += perf_counter() - t0
+
+    def end_frame(self) -> None:
+        """Put the cost of the finished frame into the histogram."""
+        if not self.enabled:
+            return
+
+        self.counts[bisect_left(self.buckets, self.work)] += 1
+        self.frames += 1
+        self.frame_time += self.work
+        self.work = 0.0
+
+    def update(self, fps: float, **gauges: float) -> None:
+        """Publish a new snapshot if it's time."""
+        if not self.enabled:
+            return
+
+        now = perf_counter()
+        if now < self.next_publish:
+            return
+        self.next_publish = now + self.interval
+
+        cumulative = []
+        total = 0
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+
+        # Replaced as a whole, so the server thread never sees a partial update
+        self.snapshot = {
+            'fps': fps,
+            'entities': len(ecs.eidx),
+            'entities_by_prop': {str(p): len(ecs.eids_by_property(p)) for p in Prop},
+            'frame_time': {
+                'buckets': dict(zip([*self.buckets, float('inf')], cumulative)),
+                'count': self.frames,
+                'sum': self.frame_time,
+            },
+            'gauges': gauges,
+            'render_calls': render_stats.frame,
+            'systems': profiler.stats() if profiler.enabled else {},
+        }
+
+    def prometheus(self) -> str:
+        snapshot = self.snapshot
+        if not snapshot:
+            return ''
+
+        lines = [
+            f'{PREFIX}_fps {snapshot["fps"]}',
+            f'{PREFIX}_entities {snapshot["entities"]}',
+        ]
+        lines.extend(f'{PREFIX}_entities_by_prop{{prop="{prop}"}} {count}'
+                     for prop, count in snapshot['entities_by_prop'].items())
+        lines.extend(f'{PREFIX}_{name} {value}' for name, value in snapshot['gauges'].items())
+        lines.extend(f'{PREFIX}_render_calls{{kind="{kind}"}} {count}'
+                     for kind, count in snapshot['render_calls'].items())
+
+        histogram = snapshot['frame_time']
+        lines.extend(f'{PREFIX}_frame_seconds_bucket{{le="{"+Inf" if le == float("inf") else le}"}} {count}'
+                     for le, count in histogram['buckets'].items())
+        lines.append(f'{PREFIX}_frame_seconds_sum {histogram["sum"]}')
+        lines.append(f'{PREFIX}_frame_seconds_count {histogram["count"]}')
+
+        for system, stats in snapshot['systems'].items():
+            for quantile in ('p50', 'p95', 'p99'):
+                q = int(quantile[1:]) / 100
+                lines.append(f'{PREFIX}_system_seconds{{system="{system}",quantile="{q}"}} {stats[f"{quantile}_ms"] / 1000}')
+            lines.extend(f'{PREFIX}_system_render_calls{{system="{system}",kind="{kind}"}} {stats[kind]}'
+                         for kind in KINDS)
+
+        return '\n'.join(lines) + '\n'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        metrics = self.server.metrics
+        if self.path == '/metrics':
+            self.reply(metrics.prometheus(), 'text/plain; version=0.0.4')
+        elif self.path == '/json':
+            self.reply(json.dumps(metrics.snapshot), 'application/json')
+        else:
+            self.send_error(404)
+
+    def reply(self, body: str, content_type: str) -> None:
+        data = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+metrics = Metrics()
@@ -0,0 +1,144 @@
+import numpy as np
+
+from ddframework.dynamicsprite import PRSA
+from pygame.math import Vector2 as vec2
+
+from missilecommand.types import EntityID
+
+
+class MotionStore:
+    """Struct of arrays for everything that flies towards a target.
+
+    Positions, momenta, targets and speeds of all missiles and smartbombs
+    live in contiguous arrays, so `sys_momentum`, `sys_smartbomb_evade`,
+    `sys_aim` and `sys_dont_overshoot` can run as a few vectorized
+    operations for all of them together, see `step`.
+
+    The launchers `add` a row when they create a mover, `non_ecs_sys_prune`
+    `remove`s it again, so nothing is gathered from the ECS per frame.  The
+    store owns the motion state of its rows, `non_ecs_sys_motion` only copies
+    the positions back into the `PRSA`s, where the collisions and the
+    renderer read them, and the momenta of the re-aimed rows.  Changes from
+    outside need to go through the store, see `speed_up`.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.size = 0
+        self.eids = []
+        self.prsas = []
+        self.rows = {}
+        self.pos = np.zeros((capacity, 2))
+        self.momentum = np.zeros((capacity, 2))
+        self.target = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.aim = np.zeros(capacity, dtype=bool)
+
+    def __repr__(self) -> str:
+        return f'MotionStore(size={self.size}, capacity={len(self.speed)})'
+
+    def __len__(self) -> int:
+        return self.size
+
+    def clear(self) -> None:
+        self.size = 0
+        self.eids.clear()
+        self.prsas.clear()
+        self.rows.clear()
+
+    def reserve(self, n: int) -> None:
+        capacity = len(self.speed)
+        if n <= capacity:
+            return
+
+        while capacity < n:
+            capacity *= 2
+
+        for name in ('pos', 'momentum', 'target', 'speed', 'aim'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def add(self, eid: EntityID, prsa: PRSA, momentum: vec2, target: vec2, speed: float, aim: bool) -> int:
+        """Register a mover, return its row.
+
+        Rows flagged with `aim` are steered towards their target every step.
+        """
+        row = self.rows.get(eid)
+        if row is None:
+            row = self.size
+            self.reserve(row + 1)
+            self.size += 1
+            self.eids.append(eid)
+            self.prsas.append(prsa)
+            self.rows[eid] = row
+        else:
+            self.prsas[row] = prsa
+
+        self.pos[row] = prsa.pos
+        self.momentum[row] = momentum
+        self.target[row] = target
+        self.speed[row] = speed
+        self.aim[row] = aim
+
+        return row
+
+    def remove(self, eid: EntityID) -> None:
+        """Drop the row of eid, the last row moves into its place."""
+        row = self.rows.pop(eid, None)
+        if row is None:
+            return
+
+        last = self.size - 1
+        if row != last:
+            for a in (self.pos, self.momentum, self.target, self.speed, self.aim):
+                a[row] = a[last]
+            self.eids[row] = self.eids[last]
+            self.prsas[row] = self.prsas[last]
+            self.rows[self.eids[row]] = row
+
+        self.eids.pop()
+        self.prsas.pop()
+        self.size = last
+
+    def speed_up(self, factor: float) -> None:
+        """Make all rows factor times faster."""
+        n = self.size
+        self.momentum[:n] *= factor
+        self.speed[:n] *= factor
+
+    def step(self, dt: float, evade_rows: np.ndarray, evade: np.ndarray) -> np.ndarray:
+        """Advance all rows by dt, return the flags of rows that arrived.
+
+        The order is the same as the one of the per entity systems:  apply
+        the momentum, add the one shot evade fix of smartbombs, re-aim
+        smartbombs at their target, then snap everything that would overshoot
+        its target onto it.
+        """
+        n = self.size
+        pos = self.pos[:n]
+        momentum = self.momentum[:n]
+        target = self.target[:n]
+
+        pos += momentum * dt
+        if len(evade_rows):
+            pos[evade_rows] += evade * dt
+
+        aim = self.aim[:n]
+        if aim.any():
+            delta = target[aim] - pos[aim]
+            length = np.hypot(delta[:, 0], delta[:, 1])
+            scale = np.divide(self.speed[:n][aim], length, out=np.zeros_like(length), where=length > 0)
+            momentum[aim] = delta * scale[:, np.newaxis]
+
+        delta = target - pos
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        speed = np.hypot(momentum[:, 0], momentum[:, 1])
+        dot = np.einsum('ij,ij->i', momentum, delta)
+        arrived = (distance == 0) | ((distance < speed) & (dot < 0))
+        pos[arrived] = target[arrived]
+
+        return arrived
+
+
+motion_store = MotionStore()
@@ -0,0 +1,89 @@
+from collections.abc import Hashable
+
+import tinyecs as ecs
+
+import missilecommand.config as C
+
+from missilecommand.types import Comp, EntityID, Prop
+
+# The components kept for reuse per pooled kind of entity.  Everything else
+# is cheap or set anew by the launchers anyway.
+POOLED = {
+    Prop.IS_MISSILE: (Comp.PRSA, Comp.TEXTURE_LIST, Comp.TRAIL, Comp.MOMENTUM, Comp.TARGET),
+    Prop.IS_EXPLOSION: (Comp.PRSA, Comp.TEXTURE_LIST, Comp.SCALE),
+    Prop.IS_TARGET: (Comp.PRSA, Comp.TEXTURE_LIST),
+}
+
+
+class EntityPool:
+    """Free lists of retired short lived entities.
+
+    Missiles, explosions and targets live for a few seconds at most.  Instead
+    of dropping their components when they die, `retire` removes the entity
+    from the ECS and keeps its ID and component objects.  The launchers
+    `acquire` them again, reset them in place and register them under the
+    old ID.  This saves the allocation of the `PRSA`, `AutoSequence`,
+    `LerpThing`, `Trail` and vectors and the creation of a new uuid per
+    entity.
+
+    At most `capacity` entities are kept per kind, the rest are dropped as
+    before.
+    """
+
+    def __init__(self, capacity: int = C.ENTITY_POOL_CAPACITY) -> None:
+        self.capacity = capacity
+        self.free = {kind: [] for kind in POOLED}
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return f'EntityPool(capacity={self.capacity}, hits={self.hits}, misses={self.misses}, free={self.size()})'
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def size(self) -> dict[Hashable, int]:
+        return {kind: len(entities) for kind, entities in self.free.items()}
+
+    def clear(self) -> None:
+        for entities in self.free.values():
+            entities.clear()
+
+    def acquire(self, kind: Hashable) -> tuple[EntityID, list] | None:
+        """Return (eid, components) of a retired entity, or None if empty.
+
+        The components are in the order given in `POOLED`.  The entity is not
+        registered in the ECS anymore, the caller needs to create it again.
+        """
+        try:
+            entity = self.free[kind].pop()
+        except IndexError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entity
+
+    def retire(self, eid: EntityID) -> None:
+        """Remove the entity from the ECS, keep it if it's of a pooled kind."""
+        if not ecs.has(eid):
+            return
+
+        kind = next((kind for kind in POOLED if ecs.has_property(eid, kind)), None)
+        if kind is None or len(self.free[kind]) >= self.capacity:
+            ecs.remove_entity(eid)
+            return
+
+        try:
+            comps = ecs.comps_of_eid(eid, *POOLED[kind])
+        except ecs.UnknownComponentError:
+            comps = None
+
+        ecs.remove_entity(eid)
+        if comps is not None:
+            self.free[kind].append((eid, comps))
+
+
+entity_pool = EntityPool()
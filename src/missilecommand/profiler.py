@@ -0,0 +1,124 @@
+import csv
+
+from collections import deque
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+import tinyecs as ecs
+
+import missilecommand.config as C
+
+from missilecommand.renderstats import KINDS, render_stats
+
+
+class Profiler:
+    """Wall time, entity counts and render calls per system.
+
+    `run_system` and `call` are drop-in wrappers for `ecs.run_system` and
+    the direct calls of the `non_ecs_sys_*` functions.  While the profiler is
+    enabled, every call is recorded as (seconds, entities, *render calls) in a
+    ring buffer of `capacity` samples per system.  For `non_ecs_sys_*`
+    functions, the number of entities alive at the time of the call is
+    recorded.  The render calls are the `RenderStats` counters the system
+    caused, in the order of `KINDS`.
+
+    While disabled, the wrappers only forward the call.
+    """
+
+    def __init__(self, capacity: int = C.PROFILER_CAPACITY) -> None:
+        self.capacity = capacity
+        self.enabled = False
+        self.samples = {}
+
+    def __repr__(self) -> str:
+        return f'Profiler(enabled={self.enabled}, systems={len(self.samples)}, capacity={self.capacity})'
+
+    def toggle(self) -> bool:
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def clear(self) -> None:
+        self.samples.clear()
+
+    def record(self, name: str, seconds: float, entities: int, render_calls: tuple[int, ...]) -> None:
+        try:
+            ring = self.samples[name]
+        except KeyError:
+            ring = self.samples[name] = deque(maxlen=self.capacity)
+        ring.append((seconds, entities, *render_calls))
+
+    def run_system(self, dt: float, fn: Callable, *cids: Hashable, **kwargs: Any) -> Any:
+        if not self.enabled:
+            return ecs.run_system(dt, fn, *cids, **kwargs)
+
+        # The same system can run on different subsets of entities
+        name = fn.__name__
+        if kwargs.get('has_properties'):
+            name = f'{name}[{",".join(sorted(kwargs["has_properties"]))}]'
+
+        calls = render_stats.snapshot()
+        t0 = perf_counter()
+        res = ecs.run_system(dt, fn, *cids, **kwargs)
+        seconds = perf_counter() - t0
+        self.record(name, seconds, len(res), _delta(calls, render_stats.snapshot()))
+
+        return res
+
+    def call(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        if not self.enabled:
+            return fn(*args, **kwargs)
+
+        calls = render_stats.snapshot()
+        t0 = perf_counter()
+        res = fn(*args, **kwargs)
+        seconds = perf_counter() - t0
+        self.record(fn.__name__, seconds, len(ecs.eidx), _delta(calls, render_stats.snapshot()))
+
+        return res
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Per system number of samples, mean entities, percentiles in ms and
+        mean render calls per kind."""
+        res = {}
+        for name, ring in self.samples.items():
+            if not ring:
+                continue
+
+            data = np.array(ring, dtype=float)
+            ms = data[:, 0] * 1000
+            p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+            res[name] = {
+                'samples': len(ring),
+                'entities': data[:, 1].mean(),
+                'mean_ms': ms.mean(),
+                'p50_ms': p50,
+                'p95_ms': p95,
+                'p99_ms': p99,
+                'max_ms': ms.max(),
+                **dict(zip(KINDS, data[:, 2:].mean(axis=0))),
+            }
+
+        return res
+
+    def export_csv(self, fname: str | Path) -> None:
+        """Write the stats of all systems, most expensive p95 first."""
+        stats = sorted(self.stats().items(), key=lambda item: item[1]['p95_ms'], reverse=True)
+        if not stats:
+            return
+
+        fields = ['system', *stats[0][1].keys()]
+        with open(fname, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for name, row in stats:
+                writer.writerow({'system': name, **row})
+
+
+def _delta(before: tuple[int, ...], after: tuple[int, ...]) -> tuple[int, ...]:
+    return tuple(b - a for a, b in zip(before, after))
+
+
+profiler = Profiler()
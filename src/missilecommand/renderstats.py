@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+from typing import Any
+
+import pygame._sdl2 as sdl2
+
+from pygame.typing import ColorLike, Point, RectLike
+
+# What is counted:
+#   draws    texture and sprite draws
+#   lines    draw_line calls
+#   rects    draw_rect, fill_rect and clear calls
+#   targets  render target switches
+#   colors   renderer draw color and texture color mod changes
+#   alphas   texture alpha mod changes
+KINDS = ('draws', 'lines', 'rects', 'targets', 'colors', 'alphas')
+
+
+class RenderStats:
+    """Counters for renderer calls and state changes.
+
+    The draw helpers below are thin wrappers around the `sdl2.Renderer` and
+    `sdl2.Texture` calls of the same name.  All drawing of the game should go
+    through them to be counted, e.g.
+
+        render_stats.draw(texture, dstrect=rect)
+
+    instead of `texture.draw(dstrect=rect)`.  Switching the render target
+    flushes the renderer, so all target switches should go through
+    `render_target`.
+
+    `counts` holds the running totals per kind.  The states call
+    `end_frame` once per drawn frame, the numbers of the last complete frame
+    are then available in `frame`.  To attribute calls to a system, take a
+    `snapshot` before and after it, see `Profiler`.
+    """
+
+    def __init__(self) -> None:
+        self.counts = dict.fromkeys(KINDS, 0)
+        self.frame = dict.fromkeys(KINDS, 0)
+        self.frames = 0
+        self._mark = self.snapshot()
+
+    def __repr__(self) -> str:
+        return f'RenderStats(frames={self.frames}, frame={self.frame})'
+
+    @property
+    def calls(self) -> int:
+        """Total of all counted calls."""
+        return sum(self.counts.values())
+
+    def snapshot(self) -> tuple[int, ...]:
+        """The running totals in the order of `KINDS`."""
+        return tuple(self.counts.values())
+
+    def count(self, kind: str, n: int = 1) -> None:
+        self.counts[kind] += n
+
+    def end_frame(self) -> None:
+        mark = self.snapshot()
+        self.frame = {kind: now - before for kind, now, before in zip(KINDS, mark, self._mark)}
+        self._mark = mark
+        self.frames += 1
+
+    def draw(self, texture: Any, *args: Any, **kwargs: Any) -> None:
+        """Draw an `sdl2.Texture` or `Sprite`."""
+        self.counts['draws'] += 1
+        texture.draw(*args, **kwargs)
+
+    def draw_line(self, renderer: sdl2.Renderer, p1: Point, p2: Point) -> None:
+        self.counts['lines'] += 1
+        renderer.draw_line(p1, p2)
+
+    def draw_rect(self, renderer: sdl2.Renderer, rect: RectLike) -> None:
+        self.counts['rects'] += 1
+        renderer.draw_rect(rect)
+
+    def fill_rect(self, renderer: sdl2.Renderer, rect: RectLike) -> None:
+        self.counts['rects'] += 1
+        renderer.fill_rect(rect)
+
+    def clear(self, renderer: sdl2.Renderer) -> None:
+        self.counts['rects'] += 1
+        renderer.clear()
+
+    def set_color(self, renderer: sdl2.Renderer, color: ColorLike) -> None:
+        """Set the draw color of the renderer."""
+        self.counts['colors'] += 1
+        renderer.draw_color = color
+
+    @contextmanager
+    def render_target(self, renderer: sdl2.Renderer, texture: sdl2.Texture | None):
+        """Temporarily draw onto texture, restore the previous target after.
+
+        Both the switch and the restore count as one target switch each.
+        """
+        bkp_target = renderer.target
+        renderer.target = texture
+        self.counts['targets'] += 1
+        try:
+            yield renderer
+        finally:
+            renderer.target = bkp_target
+            self.counts['targets'] += 1
+
+
+render_stats = RenderStats()
@@ -1,6 +1,7 @@
-from collections.abc import Sequence
+from collections.abc import Hashable, Sequence
 from typing import Callable
 
+import numpy as np
 import pygame
 import pygame._sdl2 as sdl2
 import tinyecs as ecs
@@ -17,10 +18,17 @@ from pygame.typing import ColorLike, Point
 
 import missilecommand.config as C
 
+from missilecommand.background import BackgroundLayer
+from missilecommand.broadphase import Broadphase, SpatialHash
+from missilecommand.explosions import ExplosionRegistry, explosion_registry
 from missilecommand.gamestate import gs as GS
 from missilecommand.highscoretable import highscoretable
-from missilecommand.launchers import mk_explosion, mk_ruin, mk_trail_eraser
-from missilecommand.types import Comp, EIDs, EntityID, Momentum, Prop, Trail
+from missilecommand.impacts import impact_schedule
+from missilecommand.launchers import mk_explosion, mk_ruin
+from missilecommand.motion import MotionStore, motion_store
+from missilecommand.pool import entity_pool
+from missilecommand.renderstats import render_stats
+from missilecommand.types import Comp, Contact, EIDs, EntityID, Momentum, Prop, Trail
 from missilecommand.utils import draw_text, play_sound
 
 
@@ -98,9 +106,9 @@ def sys_debug_line(dt: float, eid: EntityID, line: tuple[Point, Point], color: C
         raise RuntimeError('renderer must be given')
 
     bkp_color = renderer.draw_color
-    renderer.draw_color = color
-    renderer.draw_line(*line)
-    renderer.draw_color = bkp_color
+    render_stats.set_color(renderer, color)
+    render_stats.draw_line(renderer, *line)
+    render_stats.set_color(renderer, bkp_color)
 
 
 def sys_debug_rect(dt: float, eid: EntityID, rect: pygame.Rect, color: ColorLike,
@@ -120,9 +128,9 @@ def sys_debug_rect(dt: float, eid: EntityID, rect: pygame.Rect, color: ColorLike
         raise RuntimeError('renderer must be given')
 
     bkp_color = renderer.draw_color
-    renderer.draw_color = color
-    renderer.draw_rect(rect)
-    renderer.draw_color = bkp_color
+    render_stats.set_color(renderer, color)
+    render_stats.draw_rect(renderer, rect)
+    render_stats.set_color(renderer, bkp_color)
 
 
 def sys_detonate_flyer(dt: float,
@@ -138,10 +146,8 @@ def sys_detonate_flyer(dt: float,
 
 def sys_detonate_missile(dt: float,
                          eid: EntityID,
-                         prsa: PRSA,
-                         trail: Trail) -> None:
+                         prsa: PRSA) -> None:
     mk_explosion(prsa.pos)
-    mk_trail_eraser(trail)
     play_sound(cache['sounds']['explosion'])
 
 
@@ -165,12 +171,21 @@ def sys_dont_overshoot(dt: float, eid: EntityID,
 
 
 def sys_draw_textlabel(dt: float, eid: EntityID, text: str,
-                       prsa: PRSA, anchor: str, color: ColorLike) -> None:
+                       prsa: PRSA, anchor: str, color: ColorLike,
+                       *, exclude: Hashable | None = None) -> None:
+    if exclude is not None and ecs.has_property(eid, exclude): return
+
     draw_text(text, prsa, anchor, color)
 
 
-def sys_draw_texture(dt: float, eid: EntityID, texture: sdl2.Texture, prsa: PRSA) -> None:
-    """Render the current texture following the settings in prsa."""
+def sys_draw_texture(dt: float, eid: EntityID, texture: sdl2.Texture, prsa: PRSA,
+                     *, exclude: Hashable | None = None) -> None:
+    """Render the current texture following the settings in prsa.
+
+    Entities with the property given in `exclude` are skipped.
+    """
+    if exclude is not None and ecs.has_property(eid, exclude): return
+
     rect = texture.get_rect().scale_by(prsa.scale)
     try:
         anchor = ecs.comp_of_eid(eid, Comp.ANCHOR)
@@ -188,7 +203,7 @@ def sys_draw_texture(dt: float, eid: EntityID, texture: sdl2.Texture, prsa: PRSA
         flip_x = flip_y = False
 
     texture.alpha = prsa.alpha  # ty: ignore
-    texture.draw(dstrect=rect, angle=prsa.rotation, flip_x=flip_x, flip_y=flip_y)
+    render_stats.draw(texture, dstrect=rect, angle=prsa.rotation, flip_x=flip_x, flip_y=flip_y)
 
     texture.alpha = bkp_alpha
 
@@ -206,6 +221,16 @@ def sys_explosion(dt: float,
     prsa.scale = scale()
 
 
+def non_ecs_sys_explosions(registry: ExplosionRegistry) -> None:
+    """The registry based `sys_explosion` for all explosions at once."""
+    for eid in registry.update():
+        if ecs.has(eid):
+            ecs.set_property(eid, Prop.IS_DEAD)
+
+    for prsa, scale in zip(registry.prsas, registry.scale[:registry.size].tolist()):
+        prsa.scale = scale
+
+
 def sys_lifetime(dt: float, eid: EntityID, lifetime: Cooldown) -> None:
     """Flags entity for culling after lifetime runs out."""
     if lifetime.cold():
@@ -222,6 +247,11 @@ def sys_mouse(dt: float, eid: EntityID, prsa: PRSA, *, mouse_pos=Point) -> None:
     prsa.pos = vec2(mouse_pos)
 
 
+def sys_remember_pos(dt: float, eid: EntityID, prsa: PRSA, prev_pos: vec2) -> None:
+    """Keep the position before the motion systems run for swept collisions."""
+    prev_pos.update(prsa.pos)
+
+
 def sys_shutdown(dt: float, eid: float, shutdown: Callable) -> None:
     """Call all shutdown callbacks and remove the entity"""
 
@@ -256,246 +286,294 @@ def sys_texture_from_texture_list(dt: float, eid: EntityID, textures: Callable)
     ecs.add_component(eid, Comp.TEXTURE, textures())
 
 
-def sys_trail(dt: float,
-              eid: EntityID,
-              trail: list[tuple[Point, Point]],
-              *, texture: sdl2.Texture) -> None:
-    """Draw the trail on the dedicated trail texture"""
-    renderer = texture.renderer
-    bkp_target = renderer.target
-    bkp_color = renderer.draw_color
+def sys_update_trail(dt: float, eid: EntityID, prsa: PRSA, trail: Trail) -> None:
+    trail.head.update(prsa.pos)
 
-    renderer.target = texture
-    renderer.draw_color = C.COLOR.defense_missile
 
-    start, goal = trail[-1]
-    renderer.draw_line(start, goal)
+def non_ecs_sys_debug_prune():
+    """Purge all entities with property Prop.DEBUG"""
+    ecs.purge_by_property(Prop.DEBUG)
 
-    renderer.draw_color = bkp_color
-    renderer.target = bkp_target
 
+def non_ecs_sys_draw_background(layer: BackgroundLayer,
+                                renderer: sdl2.Renderer,
+                                size: tuple[int, int]) -> None:
+    """Draw the background layer, re-render it first if it is stale.
+
+    The frame keys hold everything an animation or a label update can change
+    without telling the layer: the current texture, text and color.
+    """
+    textures = ecs.eids_by_cids(Comp.TEXTURE, Comp.PRSA, has_properties={Prop.IS_BACKGROUND})
+    labels = ecs.eids_by_cids(Comp.TEXT, Comp.PRSA, Comp.ANCHOR, Comp.COLOR, has_properties={Prop.IS_BACKGROUND})
+
+    frames = ([(eid, id(texture)) for eid, (texture, _) in textures]
+              + [(eid, text, color) for eid, (text, _, _, color) in labels])
+
+    if layer.is_stale(frames):
+        with layer.render(renderer, size, frames):
+            for eid, (texture, prsa) in textures:
+                sys_draw_texture(0, eid, texture, prsa)
+            for eid, (text, prsa, anchor, color) in labels:
+                sys_draw_textlabel(0, eid, text, prsa, anchor, color)
+
+    layer.draw()
+
+
+def non_ecs_sys_draw_trails(renderer: sdl2.Renderer) -> None:
+    """Draw all missile trails in one batch.
+
+    The trails are drawn straight onto the current render target with a
+    single color change, instead of switching target and color per missile.
+    """
+    trails = ecs.comps_of_archetype(Comp.TRAIL)
+    if not trails:
+        return
 
-def sys_trail_eraser(dt: float,
-                     eid: EntityID,
-                     trail: Trail,
-                     *, texture: sdl2.Texture) -> None:
-    """Wipe the trail on the dedicated trail texture"""
-    renderer = texture.renderer
-    bkp_target = renderer.target
     bkp_color = renderer.draw_color
+    render_stats.set_color(renderer, C.COLOR.defense_missile)
+    for _, (trail,) in trails:
+        render_stats.draw_line(renderer, trail.origin, trail.head)
+    render_stats.set_color(renderer, bkp_color)
 
-    renderer.target = texture
-    renderer.draw_color = C.COLOR.clear
 
-    for start, goal in trail:
-        renderer.draw_line(start, goal)
+def non_ecs_sys_motion(store: MotionStore, dt: float) -> None:
+    """Move all missiles and smartbombs through the motion store.
 
-    renderer.draw_color = bkp_color
-    renderer.target = bkp_target
-    ecs.remove_entity(eid)
+    Replaces `sys_momentum`, `sys_smartbomb_evade`, `sys_aim` and
+    `sys_dont_overshoot` for everything that has a target.  The math runs
+    vectorized in the store, only the new positions and the momenta of the
+    re-aimed smartbombs are copied back per entity.
+    """
+    if not store.size:
+        return
 
+    evade_rows = []
+    evade = []
+    for eid, (evade_fix,) in ecs.eids_by_cids(Comp.EVADE_FIX):
+        ecs.remove_component(eid, Comp.EVADE_FIX)
+        row = store.rows.get(eid)
+        if row is not None:
+            evade_rows.append(row)
+            evade.append(evade_fix)
 
-def sys_update_trail(dt: float, eid: EntityID, prsa: PRSA, trail: Trail) -> None:
-    previous = trail[-1][1]
-    trail.append((previous, prsa.pos.copy()))
+    arrived = store.step(dt, np.array(evade_rows, dtype=int), np.array(evade, dtype=float).reshape(-1, 2))
 
+    for prsa, pos in zip(store.prsas, store.pos[:store.size].tolist()):
+        prsa.pos.update(pos)
+    for row in np.flatnonzero(store.aim[:store.size]).tolist():
+        ecs.comp_of_eid(store.eids[row], Comp.MOMENTUM).update(store.momentum[row].tolist())
+    for row in np.flatnonzero(arrived).tolist():
+        ecs.set_property(store.eids[row], Prop.IS_DEAD)
 
-def non_ecs_sys_debug_prune():
-    """Purge all entities with property Prop.DEBUG"""
-    ecs.purge_by_property(Prop.DEBUG)
+
+def non_ecs_sys_update_broadphase(broadphase: Broadphase) -> None:
+    """Re-index all explosions for this round of collision checks."""
+    broadphase.index_explosions(explosion_registry)
 
 
-def non_ecs_sys_collide_flyer_with_explosion() -> None:
+def non_ecs_sys_collide_flyer_with_explosion(broadphase: Broadphase, contacts: list) -> None:
     # There is actually only max 1 flyer at any given time, but in case
     # this changes when moving past the original...
     flyers = ecs.comps_of_archetype(Comp.PRSA, Comp.MASK, has_properties={Prop.IS_FLYER})
-    explosions = ecs.comps_of_archetype(Comp.PRSA, Comp.MASK, Comp.SCALE,
-                                        has_properties={Prop.IS_EXPLOSION})
     for f_eid, (f_prsa,  f_mask) in flyers:
         if ecs.has_property(f_eid, Prop.IS_DEAD) or ecs.has_property(f_eid, Prop.IS_LINGERING):
             continue
 
         f_rect = f_mask.get_rect(center=f_prsa.pos)
+        if broadphase.coverage.overlap(f_mask, f_rect.topleft):
+            contacts.append((Contact.FLYER_EXPLOSION, f_eid, None))
 
-        for e_eid, (e_prsa, e_mask, e_scale) in explosions:
-            lt = e_scale()
-            e_scaled = vec2(e_mask.get_size()) * lt
-            scaled_mask = e_mask.scale(e_scaled)
-            m_rect = scaled_mask.get_rect(center=e_prsa.pos)
-            offset = vec2(f_rect.topleft) - vec2(m_rect.topleft)
-
-            overlap = scaled_mask.overlap(f_mask, offset)
-            if overlap is None:
-                continue
-
-            # Don't flag it dead yet, just let it linger motionless for 1s
-            # until the explosion covers it.
-            ecs.set_property(f_eid, Prop.IS_LINGERING)
-            ecs.add_component(f_eid, Comp.LIFETIME, Cooldown(1))
-            momentum = ecs.comp_of_eid(f_eid, Comp.MOMENTUM)
-            momentum *= 0
-
-            mk_explosion(f_prsa.pos)
 
-            is_satellite = ecs.has_property(f_eid, Prop.IS_SATELLITE)
-            base_score = C.Score.SATELLITE if is_satellite else C.Score.PLANE
-            prev_score = GS.score // C.BONUS_CITY_SCORE
-            GS.score += GS.score_mult * base_score
-            if GS.score // C.BONUS_CITY_SCORE > prev_score:
-                GS.bonus_cities += 1
-                play_sound(cache['sounds']['bonus-city'])
+def non_ecs_sys_collide_missile_with_ground(broadphase: Broadphase, contacts: list) -> None:
+    contacts.extend((Contact.MISSILE_BATTERY, m_eid, i) for m_eid, i in impact_schedule.take('battery'))
+    contacts.extend((Contact.MISSILE_CITY, m_eid, i) for m_eid, i in impact_schedule.take('city'))
 
-            break
 
+def non_ecs_sys_collide_missile_with_explosion(broadphase: Broadphase, contacts: list) -> None:
+    missiles = list(ecs.comps_of_archetype(Comp.PRSA, Comp.TRAIL, has_properties={Prop.IS_MISSILE, Prop.IS_INCOMING}))
+    if not missiles or not broadphase.coverage:
+        return
 
-def non_ecs_sys_collide_missile_with_battery():
-    missiles = ecs.comps_of_archetype(Comp.PRSA, Comp.TRAIL, has_properties={Prop.IS_MISSILE, Prop.IS_INCOMING})
-    for m_eid, (m_prsa, *_) in missiles:
-        for i, battery in enumerate(GS.batteries):
-            if not C.HITBOX_BATTERIES[i].collidepoint(m_prsa.pos):
-                continue
+    # The trail head is only moved after the collisions, see run_game_systems
+    starts = np.array([(m_trail.head.x, m_trail.head.y) for _, (_, m_trail) in missiles])
+    ends = np.array([(m_prsa.pos.x, m_prsa.pos.y) for _, (m_prsa, _) in missiles])
+    hit, _ = broadphase.coverage.sweep(starts, ends)
 
-            ecs.set_property(m_eid, Prop.IS_DEAD)
+    contacts.extend((Contact.MISSILE_EXPLOSION, m_eid, None)
+                    for (m_eid, _), is_hit in zip(missiles, hit.tolist()) if is_hit)
 
-            if not battery: continue
 
-            for silo in GS.batteries[i]:
-                ecs.add_component(silo, Comp.LIFETIME,
-                                  Cooldown(C.EXPLOSION_DURATION))
-            GS.batteries[i].clear()
+def _ground_candidates(hitboxes: SpatialHash, kind: str, eid: EntityID,
+                       prev_pos: vec2, pos: vec2, target: tuple[str, int] | None) -> Sequence[int]:
+    """The hitboxes of kind an incoming entity moving to pos can hit.
 
-            break
+    As long as it flies straight, that's only the one it aims at.  Once a
+    smartbomb evaded, or if it aims at nothing on the ground, fall back to
+    everything near the way it moved this frame.
+    """
+    if target is None or ecs.has_property(eid, Prop.HAS_EVADED):
+        swept = pygame.Rect(prev_pos, pos - prev_pos)
+        swept.normalize()
+        return hitboxes.query_rect(swept.inflate(2, 2))
 
+    target_kind, i = target
+    return (i,) if target_kind == kind else ()
 
-def non_ecs_sys_collide_missile_with_city():
-    missiles = ecs.comps_of_archetype(Comp.PRSA, Comp.TRAIL, has_properties={Prop.IS_MISSILE, Prop.IS_INCOMING})
-    for m_eid, (m_prsa, *_) in missiles:
-        for i, c in enumerate(GS.cities):
-            if not C.HITBOX_CITY[i].collidepoint(m_prsa.pos):
-                continue
 
-            # Explode missile, even if city is already removed
-            ecs.set_property(m_eid, Prop.IS_DEAD)
-            if not c: continue
+def non_ecs_sys_collide_smartbomb_with_ground(broadphase: Broadphase, contacts: list) -> None:
+    smartbombs = ecs.comps_of_archetype(Comp.PRSA, Comp.PREV_POS, Comp.GROUND_TARGET,
+                                        has_properties={Prop.IS_SMARTBOMB})
 
-            GS.cities[i] = False
-            ecs.remove_entity(f'city-{i}')
-            mk_ruin(C.POS_CITIES[i], f'city-{i}')
+    ground = ((Contact.SMARTBOMB_BATTERY, 'battery', broadphase.batteries, C.HITBOX_BATTERIES),
+              (Contact.SMARTBOMB_CITY, 'city', broadphase.cities, C.HITBOX_CITY))
 
+    for b_eid, (b_prsa, b_prev_pos, b_target) in smartbombs:
+        for contact, kind, grid, hitboxes in ground:
+            hit = next((i for i in _ground_candidates(grid, kind, b_eid, b_prev_pos, b_prsa.pos, b_target)
+                        if hitboxes[i].clipline(b_prev_pos, b_prsa.pos)), None)
+            if hit is not None:
+                contacts.append((contact, b_eid, hit))
+                break
 
-def non_ecs_sys_collide_missile_with_explosion():
-    explosions = ecs.comps_of_archetype(Comp.PRSA, Comp.MASK, Comp.SCALE,
-                                        has_properties={Prop.IS_EXPLOSION})
-    missiles = ecs.comps_of_archetype(Comp.PRSA, Comp.TRAIL, has_properties={Prop.IS_MISSILE, Prop.IS_INCOMING})
-    for m_eid, (m_prsa, *_) in missiles:
-        for e_eid, (e_prsa, e_mask, e_scale) in explosions:
-            e_pos = e_prsa.pos
-            delta = e_pos - m_prsa.pos
-            width = e_mask.get_size()[0]
 
-            if delta.length() > e_scale() * width / 2:
-                continue
+def non_ecs_sys_collide_smartbomb_with_explosion(broadphase: Broadphase, contacts: list) -> None:
+    smartbombs = [(b_eid, comps) for b_eid, comps
+                  in ecs.comps_of_archetype(Comp.PRSA, Comp.PREV_POS, Comp.MOMENTUM,
+                                            has_properties={Prop.IS_SMARTBOMB})
+                  if not ecs.has_property(b_eid, Prop.IS_DEAD)]
+    if not smartbombs or not broadphase.coverage:
+        return
 
-            ecs.set_property(m_eid, Prop.IS_DEAD)
-            GS.score += GS.score_mult * C.Score.MISSILE
-            break
+    starts = np.array([(b_prev_pos.x, b_prev_pos.y) for _, (_, b_prev_pos, _) in smartbombs])
+    ends = np.array([(b_prsa.pos.x, b_prsa.pos.y) for _, (b_prsa, *_) in smartbombs])
+    hit, evade = broadphase.coverage.sweep(starts, ends)
+    centers, _, growing = explosion_registry.arrays()
 
+    for (b_eid, (b_prsa, _, b_momentum)), is_hit, col, end in zip(smartbombs, hit.tolist(), evade.tolist(), ends):
+        # explode
+        if is_hit:
+            contacts.append((Contact.SMARTBOMB_EXPLOSION, b_eid, None))
+            continue
 
-def non_ecs_sys_collide_smartbomb_with_battery():
-    smartbombs = ecs.comps_of_archetype(Comp.PRSA, has_properties={Prop.IS_SMARTBOMB})
+        # The field only knows the newest growing explosion in reach.  That
+        # one might be behind the bomb while an older one is in its way, so
+        # look at all of them.
+        if col < 0:
+            continue
 
-    for b_eid, (b_prsa, *_) in smartbombs:
-        for i, battery in enumerate(GS.batteries):
-            if not C.HITBOX_BATTERIES[i].collidepoint(b_prsa.pos):
-                continue
+        deltas = centers - end
+        ahead = (growing
+                 & (np.einsum('ij,ij->i', deltas, deltas) < C.EXPLOSION_EVADE_RADIUS ** 2)
+                 & (deltas @ (b_momentum.x, b_momentum.y) >= 0))
+        candidates = np.flatnonzero(ahead)
+        if not len(candidates):
+            continue
 
-            # Mark as dead, even if battery is already emptied
-            ecs.set_property(b_eid, Prop.IS_DEAD)
+        # evade, the newest explosion wins, same as the last EVADE_FIX before
+        delta = vec2(deltas[candidates[-1]].tolist())
+        dlen = delta.length()
+        speed = b_momentum.length()
 
-            if not battery: continue
+        if dlen < 1.25 * C.EXPLOSION_RADIUS:
+            # Just dodge towards outside of radius
+            dodge = -delta.normalize() * speed
 
-            for silo in GS.batteries[i]:
-                ecs.add_component(silo, Comp.LIFETIME,
-                                  Cooldown(C.EXPLOSION_DURATION))
-            GS.batteries[i].clear()
-            break
+        else:
+            # dodge left or right
+            left_dodge = delta.rotate(90).normalize()
+            right_dodge = delta.rotate(-90).normalize()
+            # dot > 0 --> Still moving towards target
+            if b_momentum * left_dodge > 0:
+                dodge = left_dodge * speed
+            else:
+                dodge = right_dodge * speed
 
+        contacts.append((Contact.SMARTBOMB_EVADE, b_eid, dodge))
 
-def non_ecs_sys_collide_smartbomb_with_city():
-    smartbombs = ecs.comps_of_archetype(Comp.PRSA, has_properties={Prop.IS_SMARTBOMB})
 
-    for b_eid, (b_prsa,) in smartbombs:
-        if ecs.has_property(b_eid, Prop.IS_DEAD):
-            continue
+def _destroy_battery(i: int) -> None:
+    if not GS.batteries[i]: return
 
-        for i, c in enumerate(GS.cities):
-            if not C.HITBOX_CITY[i].collidepoint(b_prsa.pos):
-                continue
+    for silo in GS.batteries[i]:
+        ecs.add_component(silo, Comp.LIFETIME,
+                          Cooldown(C.EXPLOSION_DURATION))
+    GS.batteries[i].clear()
 
-            ecs.set_property(b_eid, Prop.IS_DEAD)
-            if not c: continue
 
-            GS.cities[i] = False
-            ecs.remove_entity(f'city-{i}')
-            mk_ruin(C.POS_CITIES[i], f'city-{i}')
+def _destroy_city(i: int) -> None:
+    if not GS.cities[i]: return
 
-    ecs.add_component(EIDs.SCORE, Comp.TEXT, f'{GS.score:5d}  ')
-    if GS.score > highscoretable.leader.score:
-        ecs.add_component(EIDs.HIGHSCORE, Comp.TEXT, f'{GS.score:5d}')
+    GS.cities[i] = False
+    ecs.remove_entity(f'city-{i}')
+    mk_ruin(C.POS_CITIES[i], f'city-{i}')
 
 
-def non_ecs_sys_collide_smartbomb_with_explosion():
-    explosions = ecs.comps_of_archetype(Comp.PRSA, Comp.MASK, Comp.SCALE,
-                                        has_properties={Prop.IS_EXPLOSION})
-    smartbombs = ecs.comps_of_archetype(Comp.PRSA, Comp.TARGET, Comp.MOMENTUM,
-                                        has_properties={Prop.IS_SMARTBOMB})
+def non_ecs_sys_resolve_contacts(contacts: list) -> None:
+    """Apply all contacts of this round of collision checks.
 
-    for b_eid, (b_prsa, b_target, b_momentum) in smartbombs:
-        if ecs.has_property(b_eid, Prop.IS_DEAD):
+    Contacts are handled in the order they were found.  Every entity is only
+    hit once, later contacts of an entity already hit are ignored.  The one
+    exception is a missile crashing into the ground, if it's shot down in the
+    same round, that still scores.  The score is added in one go at the end,
+    so the bonus city check and the score labels only need to be updated
+    once.
+    """
+    hit = set()
+    points = 0
+    for kind, a, b in contacts:
+        if a in hit:
             continue
 
-        for e_eid, (e_prsa, e_mask, e_scale) in explosions:
-            lt = e_scale()
-            explosion_growing = e_scale.loops == 1
-            delta = e_prsa.pos - b_prsa.pos
-            dlen = delta.length()
+        match kind:
+            case Contact.SMARTBOMB_EVADE:
+                ecs.add_component(a, Comp.EVADE_FIX, b)
+                ecs.set_property(a, Prop.HAS_EVADED)
+                continue
 
-            # explode
-            if dlen <= lt * C.EXPLOSION_RADIUS:
-                ecs.set_property(b_eid, Prop.IS_DEAD)
+            case Contact.FLYER_EXPLOSION:
+                # Don't flag it dead yet, just let it linger motionless for 1s
+                # until the explosion covers it.
+                hit.add(a)
+                ecs.set_property(a, Prop.IS_LINGERING)
+                ecs.add_component(a, Comp.LIFETIME, Cooldown(1))
+                prsa, momentum = ecs.comps_of_eid(a, Comp.PRSA, Comp.MOMENTUM)
+                momentum *= 0
+                mk_explosion(prsa.pos)
+
+                is_satellite = ecs.has_property(a, Prop.IS_SATELLITE)
+                points += C.Score.SATELLITE if is_satellite else C.Score.PLANE
+                continue
 
-                prev_score = GS.score // C.BONUS_CITY_SCORE
-                GS.score += GS.score_mult * C.Score.SMARTBOMB
-                if GS.score // C.BONUS_CITY_SCORE > prev_score:
-                    GS.bonus_cities += 1
-                    play_sound(cache['sounds']['bonus-city'])
+            case Contact.MISSILE_BATTERY | Contact.SMARTBOMB_BATTERY:
+                # Explode, even if battery is already emptied
+                _destroy_battery(b)
 
-            # evade
-            elif explosion_growing and dlen < 1.5 * C.EXPLOSION_RADIUS:
+            case Contact.MISSILE_CITY | Contact.SMARTBOMB_CITY:
+                # Explode, even if city is already removed
+                _destroy_city(b)
 
-                if delta * b_momentum < 0:
-                    continue
+            case Contact.MISSILE_EXPLOSION:
+                impact_schedule.cancel(a)
+                points += C.Score.MISSILE
 
-                speed = b_momentum.length()
+            case Contact.SMARTBOMB_EXPLOSION:
+                points += C.Score.SMARTBOMB
 
-                if dlen < 1.25 * C.EXPLOSION_RADIUS:
-                    # Just dodge towards outside of radius
-                    dodge = -delta.normalize() * speed
+        ecs.set_property(a, Prop.IS_DEAD)
+        if kind not in (Contact.MISSILE_BATTERY, Contact.MISSILE_CITY):
+            hit.add(a)
 
-                else:
-                    # dodge left or right
-                    left_dodge = delta.rotate(90).normalize()
-                    right_dodge = delta.rotate(-90).normalize()
-                    # dot > 0 --> Still moving towards target
-                    if b_momentum * left_dodge > 0:
-                        dodge = left_dodge * speed
-                    else:
-                        dodge = right_dodge * speed
+    if points and GS.add_score(GS.score_mult * points):
+        play_sound(cache['sounds']['bonus-city'])
 
-                ecs.add_component(b_eid, Comp.EVADE_FIX, dodge)
+    ecs.add_component(EIDs.SCORE, Comp.TEXT, f'{GS.score:5d}  ')
+    if GS.score > highscoretable.leader.score:
+        ecs.add_component(EIDs.HIGHSCORE, Comp.TEXT, f'{GS.score:5d}')
 
 
 def non_ecs_sys_prune():
+    """Remove all dead entities, short lived ones go back to the pool."""
     dead = ecs.eids_by_property(Prop.IS_DEAD)
     for eid in dead:
-        ecs.remove_entity(eid)
+        motion_store.remove(eid)
+        entity_pool.retire(eid)
@@ -14,11 +14,14 @@ from pygame import _sdl2 as sdl2
 from pygame import Vector2 as vec2
 
 import missilecommand.config as C
+from missilecommand.explosions import explosion_registry
 from missilecommand.launchers import mk_explosion, mk_quickhelp
-from missilecommand.systems import (non_ecs_sys_prune, sys_draw_textlabel,
-                                    sys_draw_texture, sys_explosion,
+from missilecommand.renderstats import render_stats
+from missilecommand.systems import (non_ecs_sys_explosions, non_ecs_sys_prune,
+                                    sys_draw_textlabel, sys_draw_texture,
                                     sys_shutdown, sys_textblink,
                                     sys_texture_from_texture_list)
+from missilecommand.tracer import tracer
 from missilecommand.types import Comp, Prop
 from missilecommand.utils import check_for_exit, draw_text, play_sound
 
@@ -28,14 +31,9 @@ def sys_create_crater(dt, eid, prsa, texture=None):
 
     ecs.remove_property(eid, Prop.IS_GROWING)
 
-    renderer = texture.renderer
-    bkp_target = renderer.target
-
-    renderer.target = texture
-    crater = cache['textures']['crater']
-    crater.draw(dstrect=crater.get_rect().move_to(center=prsa.pos))
-
-    renderer.target = bkp_target
+    with render_stats.render_target(texture.renderer, texture):
+        crater = cache['textures']['crater']
+        render_stats.draw(crater, dstrect=crater.get_rect().move_to(center=prsa.pos))
 
 
 class TitlePhase(StrEnum):
@@ -78,26 +76,25 @@ class Title(GameState):
 
     def reset(self, *args: Any, **kwargs: Any) -> None:
         ecs.reset()
+        explosion_registry.clear()
 
         txt_missile = C.MESSAGES['title']['MISSILE']
         txt_command = C.MESSAGES['title']['COMMAND']
 
-        bkp_target = self.renderer.target
         bkp_color = self.renderer.draw_color
 
-        self.renderer.target = self.crater_canvas
-        self.renderer.draw_color = C.COLOR.clear
-        self.renderer.clear()
+        with render_stats.render_target(self.renderer, self.crater_canvas):
+            render_stats.set_color(self.renderer, C.COLOR.clear)
+            render_stats.clear(self.renderer)
 
-        draw_text(txt_missile.text, PRSA(pos=txt_missile.pos, scale=txt_missile.scale), anchor=txt_missile.anchor, color=txt_missile.color)
-        draw_text(txt_command.text, PRSA(pos=txt_command.pos, scale=txt_command.scale), anchor=txt_command.anchor, color=txt_command.color)
+            draw_text(txt_missile.text, PRSA(pos=txt_missile.pos, scale=txt_missile.scale), anchor=txt_missile.anchor, color=txt_missile.color)
+            draw_text(txt_command.text, PRSA(pos=txt_command.pos, scale=txt_command.scale), anchor=txt_command.anchor, color=txt_command.color)
 
-        self.renderer.target = bkp_target
-        self.renderer.draw_color = bkp_color
+        render_stats.set_color(self.renderer, bkp_color)
 
         mk_quickhelp()
 
-        self.phase_walker = phases.walker()
+        self.phase_walker = tracer.walker('Title', phases.walker())
         self.phase = next(self.phase_walker)
 
         self.explosions = set()
@@ -116,7 +113,8 @@ class Title(GameState):
         update_fn = self.phase_handlers[self.phase]
         update_fn(dt)
 
-        ecs.run_system(dt, sys_explosion, Comp.TEXTURE_LIST, Comp.PRSA, Comp.SCALE, has_properties={Prop.IS_EXPLOSION})
+        # mk_explosion registers in the registry, so it has to drop them again
+        non_ecs_sys_explosions(explosion_registry)
         ecs.run_system(dt, sys_shutdown, Comp.SHUTDOWN, has_properties={Prop.IS_DEAD})
         ecs.run_system(dt, sys_create_crater, Comp.PRSA, texture=self.crater_canvas, has_properties={Prop.IS_GROWING})
         ecs.run_system(dt, sys_texture_from_texture_list, Comp.TEXTURE_LIST)
@@ -173,10 +171,11 @@ class Title(GameState):
         # self.app.renderer.draw_color = C.COLOR.background
         # self.app.renderer.clear()
 
-        self.crater_canvas.draw(dstrect=self.app.logical_rect)
+        render_stats.draw(self.crater_canvas, dstrect=self.app.logical_rect)
         ecs.run_system(0, sys_textblink, Comp.COLOR_CYCLE)
         ecs.run_system(0, sys_draw_textlabel, Comp.TEXT, Comp.PRSA, Comp.ANCHOR, Comp.COLOR)
         ecs.run_system(0, sys_draw_texture, Comp.TEXTURE, Comp.PRSA)
+        render_stats.end_frame()
 
     def teardown(self) -> None:
         ecs.reset()
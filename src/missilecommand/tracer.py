@@ -0,0 +1,170 @@
+"""Chrome/Perfetto trace-event export.
+
+When started, the tracer records the `dispatch_event`, `update` and `draw`
+calls of all instrumented game states as complete events, and phase changes
+and state pushes as instant events.  The events are handed to a writer
+thread through a bounded queue.  If the writer can't keep up, events are
+dropped and counted instead of stalling the frame.
+
+The resulting file can be loaded in `chrome://tracing` or
+https://ui.perfetto.dev.
+
+While the tracer is not started, all hooks return their arguments unchanged,
+so the game runs without any tracing overhead.
+"""
+
+import json
+import os
+import threading
+
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Full, Queue
+from time import perf_counter_ns
+from typing import Any
+
+from ddframework.app import GameState
+
+import missilecommand.config as C
+
+TRACED_METHODS = ('dispatch_event', 'update', 'draw', 'reset', 'restart', 'teardown')
+
+
+class Tracer:
+    def __init__(self, queue_size: int = C.TRACE_QUEUE_SIZE) -> None:
+        self.queue = Queue(maxsize=queue_size)
+        self.enabled = False
+        self.dropped = 0
+        self.thread = None
+        self.t0 = perf_counter_ns()
+        self.pid = os.getpid()
+
+    def __repr__(self) -> str:
+        return f'Tracer(enabled={self.enabled}, dropped={self.dropped})'
+
+    def now(self) -> float:
+        """Microseconds since the tracer was created."""
+        return (perf_counter_ns() - self.t0) / 1000
+
+    def start(self, fname: str | Path) -> None:
+        if self.enabled:
+            return
+
+        self.thread = threading.Thread(target=self._writer, args=(fname,), name='tracer', daemon=True)
+        self.thread.start()
+        self.enabled = True
+        self.emit({'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'args': {'name': C.TITLE}})
+
+    def stop(self) -> None:
+        """Flush all pending events and close the trace file."""
+        if not self.enabled:
+            return
+
+        self.enabled = False
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+
+    def emit(self, event: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except Full:
+            self.dropped += 1
+
+    def complete(self, name: str, cat: str, ts: float, dur: float) -> None:
+        self.emit({'name': name, 'cat': cat, 'ph': 'X', 'ts': ts, 'dur': dur,
+                   'pid': self.pid, 'tid': threading.get_ident()})
+
+    def instant(self, name: str, cat: str) -> None:
+        if not self.enabled:
+            return
+
+        self.emit({'name': name, 'cat': cat, 'ph': 'i', 's': 'g', 'ts': self.now(),
+                   'pid': self.pid, 'tid': threading.get_ident()})
+
+    @contextmanager
+    def span(self, name: str, cat: str = 'game'):
+        if not self.enabled:
+            yield
+            return
+
+        ts = self.now()
+        try:
+            yield
+        finally:
+            self.complete(name, cat, ts, self.now() - ts)
+
+    def wrap(self, name: str, fn: Callable, cat: str = 'state') -> Callable:
+        def traced(*args: Any, **kwargs: Any) -> Any:
+            if not self.enabled:
+                return fn(*args, **kwargs)
+
+            ts = self.now()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.complete(name, cat, ts, self.now() - ts)
+
+        return traced
+
+    def instrument(self, state: Any) -> Any:
+        """Trace the frame methods of a game state."""
+        if not self.enabled or not isinstance(state, GameState) or getattr(state, '_traced', False):
+            return state
+
+        name = type(state).__name__
+        for method in TRACED_METHODS:
+            fn = getattr(state, method, None)
+            if fn is not None:
+                setattr(state, method, self.wrap(f'{name}.{method}', fn))
+        state._traced = True
+
+        return state
+
+    def install(self, app: Any) -> None:
+        """Mark and instrument every state pushed onto the app stack."""
+        if not self.enabled:
+            return
+
+        push = app.push
+
+        def traced_push(state: Any, *args: Any, **kwargs: Any) -> Any:
+            self.instant(f'push {type(state).__name__}', 'stack')
+            self.instrument(state)
+            return push(state, *args, **kwargs)
+
+        app.push = traced_push
+
+    def walker(self, name: str, walker: Iterator) -> Iterator:
+        """Mark every phase a `StateMachine` walker yields."""
+        if not self.enabled:
+            return walker
+
+        return self._traced_walker(name, walker)
+
+    def _traced_walker(self, name: str, walker: Generator) -> Generator:
+        # Forward `send` to the inner walker, the phase machines use it to
+        # pick a branch.
+        value = None
+        while True:
+            try:
+                phase = walker.send(value)
+            except StopIteration:
+                return
+
+            self.instant(f'{name}: {phase}', 'phase')
+            value = yield phase
+
+    def _writer(self, fname: str | Path) -> None:
+        with open(fname, 'w') as f:
+            f.write('[\n')
+            sep = ''
+            while (event := self.queue.get()) is not None:
+                f.write(sep)
+                f.write(json.dumps(event))
+                sep = ',\n'
+            f.write('\n]\n')
+
+
+tracer = Tracer()
@@ -9,16 +9,44 @@ from pygame.typing import Point
 Container = pygame.Rect
 EntityID = Hashable
 Momentum = vec2
-Trail = list[tuple[Point, Point]]
+
+
+class Trail:
+    """The line left behind by a missile.
+
+    Missiles fly in a straight line, so the launch position and the current
+    head are all that is needed to draw the trail.
+    """
+    __slots__ = ('origin', 'head')
+
+    def __init__(self, origin: Point) -> None:
+        self.origin = vec2(origin)
+        self.head = vec2(origin)
+
+    def __repr__(self) -> str:
+        return f'Trail({self.origin}, {self.head})'
+
+
+class Contact(StrEnum):
+    # (kind, a, b) tuples from the collision systems, see non_ecs_sys_resolve_contacts
+    FLYER_EXPLOSION = auto()  # a: flyer, b: None
+    MISSILE_BATTERY = auto()  # a: missile, b: battery index
+    MISSILE_CITY = auto()  # a: missile, b: city index
+    MISSILE_EXPLOSION = auto()  # a: missile, b: None
+    SMARTBOMB_BATTERY = auto()  # a: smartbomb, b: battery index
+    SMARTBOMB_CITY = auto()  # a: smartbomb, b: city index
+    SMARTBOMB_EVADE = auto()  # a: smartbomb, b: dodge momentum
+    SMARTBOMB_EXPLOSION = auto()  # a: smartbomb, b: None
 
 
 class Prop(StrEnum):
     # Flags
     DEBUG = auto()
+    HAS_EVADED = auto()  # Smartbomb left its straight line to the target
+    IS_BACKGROUND = auto()  # Drawn into the cached background layer
     IS_BATTERY = auto()  # Batteries contain silos (unlaunched missiles)
     IS_CITY = auto()  # This is a city
     IS_DEAD = auto()  # This object is dead and will be culled by a system
-    IS_DEAD_TRAIL = auto()  # Trail eraser
     IS_DEBRIEFING = auto()  # Entities created in Debriefing
     IS_DEFENSE = auto()  # opposite of IS_INCOMING
     IS_ESCAPED = auto()  # Flyer escaped and won't explode
@@ -37,7 +65,7 @@ class Prop(StrEnum):
     IS_SMARTBOMB = auto()  # Yeah, this...
     IS_TARGET = auto()  # Crosshair after mouse click
     IS_TEXT = auto()  # Any text label
-    IS_TRAIL = auto()  # Line segments left by missiles
+    IS_TRAIL = auto()  # Line left by missiles
 
 
 class Comp(StrEnum):
@@ -45,6 +73,7 @@ class Comp(StrEnum):
     ANCHOR = auto()  # sys_draw_textlabel, sys_draw_texture
     BATTERY_ID = auto()  # To identify which battery a silo belongs to
     COLOR = auto()  # sys_draw_textlabel
+    GROUND_TARGET = auto()  # (kind, index) of the city/battery on the way, see first_contact
     ID = auto()  # General id, always belongs to the entity
     WANTS_MOUSE = auto()  # sys_mouse, bool - for entities that want mouse position in prsa.pos
 
@@ -59,6 +88,7 @@ class Comp(StrEnum):
     MASK = auto()  # sprite mask for collision checks
     MOMENTUM = auto()  # sys_momentum
     PARENT_TYPE = auto()  # sound checks if any of its parent sprites are active
+    PREV_POS = auto()  # sys_remember_pos, position before this frame's motion
     PRSA = auto()
     RECT = auto()  # Just a generic rect, right now only for debugging
     SCALE = auto()  # LerpThing, sys_apply_scale
@@ -71,14 +101,13 @@ class Comp(StrEnum):
     TEXT_SEQUENCE = auto()
     TEXTURE = auto()  # sys_draw_texture, sys_texture_from_texture_list - Exactly what it says
     TEXTURE_LIST = auto()  # sys_draw_texture - An AutoSequence for textures
-    TRAIL = auto()  # sys_trail, sys_update_trail, sys_trail_eraser
+    TRAIL = auto()  # sys_update_trail, non_ecs_sys_draw_trails
 
 
 class EIDs(StrEnum):
     BONUS_CITIES = auto()
     BONUS_POINTS = auto()
     CITIES_LABEL = auto()
-    FLYER = auto()
     FLYER_SOUND = auto()  # flyer sound is a singleton
     HIGHSCORE = auto()
     MISSILES_LABEL = auto()
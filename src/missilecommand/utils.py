@@ -4,13 +4,15 @@ import pygame
 import pygame._sdl2 as sdl2
 import tinyecs as ecs
 
-from ddframework.cache import cache
 from ddframework.dynamicsprite import PRSA
 from pygame.typing import ColorLike, Point
 
 from pgcooldown import remap
 
 import missilecommand.config as C
+
+from missilecommand.labelcache import label_cache
+from missilecommand.renderstats import render_stats
 from missilecommand.soundpool import soundpool
 
 
@@ -22,15 +24,13 @@ def check_for_exit(e):
 def cls(texture: sdl2.Texture, color: ColorLike = 'black') -> None:
     """clear the given texture"""
     renderer = texture.renderer
-    bkp_target = renderer.target
     bkp_color = renderer.draw_color
 
-    renderer.target = texture
-    renderer.draw_color = color
-    renderer.clear()
+    with render_stats.render_target(renderer, texture):
+        render_stats.set_color(renderer, color)
+        render_stats.clear(renderer)
 
-    renderer.target = bkp_target
-    renderer.draw_color = bkp_color
+    render_stats.set_color(renderer, bkp_color)
 
 
 def constraint_mouse(window, renderer, rect):
@@ -41,29 +41,18 @@ def constraint_mouse(window, renderer, rect):
 
 def debug_rect(renderer, rect, color='red'):
     bkp_color = renderer.draw_color
-    renderer.draw_color = color
-    renderer.draw_rect(rect)
-    renderer.draw_color = bkp_color
+    render_stats.set_color(renderer, color)
+    render_stats.draw_rect(renderer, rect)
+    render_stats.set_color(renderer, bkp_color)
 
 
 def draw_text(text: str, prsa: PRSA, anchor: str, color: ColorLike) -> None:
-    font = cache['textures']['letters']
-    crect = font[0].get_rect().scale_by(prsa.scale)
-    rect = crect.scale_by(len(text), 1)
+    if not text: return
+
+    label = label_cache.get(text, color, prsa.scale)
+    rect = label.get_rect()
     setattr(rect, anchor, prsa.pos)
-    crect.midleft = rect.midleft
-
-    col = pygame.Color(color)
-    for c in text:
-        letter = font[C.CHAR_MAP[c]]
-        bkp_color = letter.color
-        bkp_alpha = letter.alpha
-        letter.color = col
-        letter.alpha = col.a
-        letter.draw(dstrect=crect)
-        letter.color = bkp_color
-        letter.alpha = bkp_alpha
-        crect.midleft = crect.midright
+    render_stats.draw(label, dstrect=rect)
 
 
 def play_sound(sound: pygame.mixer.Sound, *args, **kwargs) -> int:
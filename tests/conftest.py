@@ -0,0 +1,78 @@
+import os
+
+from collections import defaultdict
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+import tinyecs as ecs  # noqa: E402
+
+from ddframework.cache import cache  # noqa: E402
+
+import missilecommand.config as C  # noqa: E402
+
+from missilecommand import headless  # noqa: E402
+from missilecommand.explosions import explosion_registry  # noqa: E402
+from missilecommand.gamestate import gs as GS  # noqa: E402
+from missilecommand.impacts import impact_schedule  # noqa: E402
+from missilecommand.motion import motion_store  # noqa: E402
+from missilecommand.pool import entity_pool  # noqa: E402
+from missilecommand.types import Comp, EIDs  # noqa: E402
+
+# All lerps and cooldowns only move with `sim_clock`, so the tests control time
+headless.install_sim_clock()
+C.PLAY_AUDIO = False
+
+ARCHETYPES = (
+    (Comp.PRSA, ),
+    (Comp.PRSA, Comp.MASK),
+    (Comp.PRSA, Comp.MOMENTUM),
+    (Comp.PRSA, Comp.EVADE_FIX),
+    (Comp.PRSA, Comp.MOMENTUM, Comp.TARGET),
+    (Comp.PRSA, Comp.TARGET, Comp.MOMENTUM, Comp.SPEED),
+    (Comp.PRSA, Comp.PREV_POS, Comp.MOMENTUM),
+    (Comp.PRSA, Comp.PREV_POS, Comp.GROUND_TARGET),
+    (Comp.TRAIL, ),
+)
+
+
+def reset_world():
+    """An empty ECS, with stand-ins for the assets the launchers look up."""
+    cache['textures'].update({
+        'missile-heads': ['missile-head'],
+        'explosions': ['explosion-1', 'explosion-2'],
+        'targets': ['target'],
+        'smartbomb_red': 'smartbomb-red',
+        'smartbomb_green': 'smartbomb-green',
+        'small-ruins': ['small-ruin'],
+    })
+    cache['masks']['explosions'] = [pygame.mask.Mask((32, 32), fill=True)]
+    cache['sounds'] = defaultdict(lambda: None)
+
+    ecs.reset()
+    for archetype in ARCHETYPES:
+        ecs.create_archetype(*archetype)
+
+    explosion_registry.clear()
+    impact_schedule.clear()
+    motion_store.clear()
+    entity_pool.clear()
+    entity_pool.hits = entity_pool.misses = 0
+
+    GS.reset()
+    GS.cities = [True] * 6
+    GS.batteries = [[], [], []]
+    for i in range(len(GS.cities)):
+        ecs.create_entity(f'city-{i}')
+    ecs.create_entity(EIDs.SCORE)
+    ecs.create_entity(EIDs.HIGHSCORE)
+
+
+@pytest.fixture
+def world():
+    """A fresh world, call the fixture value to start over within a test."""
+    reset_world()
+    yield reset_world
+    C.MOTION_STORE = False
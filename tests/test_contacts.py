@@ -0,0 +1,108 @@
+import tinyecs as ecs
+
+from ddframework.dynamicsprite import PRSA
+from pygame.math import Vector2 as vec2
+
+import missilecommand.config as C
+
+from missilecommand.gamestate import GameState, gs as GS
+from missilecommand.impacts import impact_schedule
+from missilecommand.launchers import mk_missile, mk_smartbomb
+from missilecommand.systems import non_ecs_sys_resolve_contacts
+from missilecommand.types import Comp, Contact, EIDs, Prop
+
+
+def incoming(x=100):
+    return mk_missile(vec2(x, 0), vec2(C.HITBOX_CITY[2].center), 50, incoming=True)
+
+
+def smartbomb(x=100):
+    return mk_smartbomb(vec2(x, 0), vec2(C.HITBOX_CITY[3].center), 30, None)
+
+
+def flyer():
+    eid = ecs.create_entity()
+    ecs.set_property(eid, Prop.IS_FLYER)
+    ecs.add_component(eid, Comp.PRSA, PRSA(vec2(50, 50)))
+    ecs.add_component(eid, Comp.MOMENTUM, vec2(20, 0))
+    return eid
+
+
+def test_missile_shot_down_on_the_ground_scores(world):
+    missile = incoming()
+
+    non_ecs_sys_resolve_contacts([(Contact.MISSILE_CITY, missile, 2),
+                                  (Contact.MISSILE_EXPLOSION, missile, None)])
+
+    assert GS.cities == [True, True, False, True, True, True]
+    assert ecs.has_property(missile, Prop.IS_DEAD)
+    assert GS.score == C.Score.MISSILE
+    assert len(impact_schedule) == 0
+    assert ecs.comp_of_eid(EIDs.SCORE, Comp.TEXT) == f'{C.Score.MISSILE:5d}  '
+
+
+def test_smartbomb_on_the_ground_does_not_score(world):
+    bomb = smartbomb()
+
+    non_ecs_sys_resolve_contacts([(Contact.SMARTBOMB_CITY, bomb, 3),
+                                  (Contact.SMARTBOMB_EXPLOSION, bomb, None)])
+
+    assert GS.cities == [True, True, True, False, True, True]
+    assert ecs.has_property(bomb, Prop.IS_DEAD)
+    assert GS.score == 0
+
+
+def test_each_entity_is_hit_once(world):
+    missile, bomb, plane = incoming(), smartbomb(), flyer()
+    GS.score_mult = 2
+
+    non_ecs_sys_resolve_contacts([
+        (Contact.FLYER_EXPLOSION, plane, None),
+        (Contact.MISSILE_EXPLOSION, missile, None),
+        (Contact.MISSILE_EXPLOSION, missile, None),
+        (Contact.SMARTBOMB_EVADE, bomb, vec2(-30, 0)),
+        (Contact.SMARTBOMB_EXPLOSION, bomb, None),
+        (Contact.SMARTBOMB_EXPLOSION, bomb, None),
+        (Contact.SMARTBOMB_CITY, bomb, 3),
+        (Contact.FLYER_EXPLOSION, plane, None),
+    ])
+
+    assert GS.score == 2 * (C.Score.PLANE + C.Score.MISSILE + C.Score.SMARTBOMB)
+    assert all(GS.cities)
+    assert ecs.has_property(bomb, Prop.HAS_EVADED)
+    assert ecs.has_property(plane, Prop.IS_LINGERING)
+    assert not ecs.has_property(plane, Prop.IS_DEAD)
+
+    # Only the one explosion of the flyer
+    assert len(ecs.eids_by_property(Prop.IS_EXPLOSION)) == 1
+
+
+def test_bonus_city_threshold_crossed_once(world):
+    GS.score = C.BONUS_CITY_SCORE - 30
+    missiles = [incoming(10 * i) for i in range(3)]
+
+    non_ecs_sys_resolve_contacts([(Contact.MISSILE_EXPLOSION, eid, None) for eid in missiles])
+    assert GS.score == C.BONUS_CITY_SCORE + 30
+    assert GS.bonus_cities == 1
+
+    # Same frame, second round, nothing new
+    non_ecs_sys_resolve_contacts([(Contact.MISSILE_EXPLOSION, eid, None) for eid in missiles[:1]])
+    non_ecs_sys_resolve_contacts([])
+    assert GS.score == C.BONUS_CITY_SCORE + 30 + C.Score.MISSILE
+    assert GS.bonus_cities == 1
+
+
+def test_add_score():
+    gs = GameState()
+
+    assert gs.add_score(C.BONUS_CITY_SCORE - 1) == 0
+    assert gs.add_score(1) == 1
+    assert gs.add_score(0) == 0
+    assert gs.add_score(C.BONUS_CITY_SCORE - 1) == 0
+    assert gs.add_score(2 * C.BONUS_CITY_SCORE + 1) == 3
+    assert (gs.score, gs.bonus_cities) == (4 * C.BONUS_CITY_SCORE, 4)
+
+    # Crossed in small steps, still only once per threshold
+    gs = GameState()
+    assert sum(gs.add_score(C.Score.MISSILE) for _ in range(2 * C.BONUS_CITY_SCORE // C.Score.MISSILE)) == 2
+    assert gs.bonus_cities == 2
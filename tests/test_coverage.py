@@ -0,0 +1,136 @@
+import numpy as np
+
+import missilecommand.config as C
+
+from missilecommand.coverage import CoverageField
+
+# A point is judged by the center of its pixel, which is at most half a
+# pixel diagonal away.
+RIM = 0.5 ** 0.5
+# The sweep samples every half pixel, the sample next to the closest point of
+# a segment can be another quarter pixel further out.
+SWEEP_RIM = RIM + 0.25
+
+EXPLOSIONS = [
+    # center, radius, growing
+    ((40.3, 50.8), 16.0, True),
+    ((60.5, 60.5), 9.25, False),
+    ((200.7, 120.1), 12.6, True),
+    ((128.0, 10.0), 3.4, False),
+    ((250.2, 230.9), 16.0, True),
+    # Just started, the smallest target to tunnel through
+    ((100.4, 150.6), 1.6, True),
+]
+
+
+def mk_field():
+    field = CoverageField(C.SCREEN)
+    for row, (center, radius, growing) in enumerate(EXPLOSIONS):
+        field.stamp(row, center, radius, growing, 1)
+
+    return field
+
+
+def distances(points):
+    """Exact distances of m points to the n explosion centers, m x n."""
+    centers = np.array([center for center, _, _ in EXPLOSIONS])
+    delta = points[:, np.newaxis, :] - centers[np.newaxis, :, :]
+    return np.hypot(delta[..., 0], delta[..., 1])
+
+
+def segment_distances(starts, ends):
+    """Exact distances of the closest points of m segments, m x n."""
+    centers = np.array([center for center, _, _ in EXPLOSIONS])
+    delta = ends - starts
+    length2 = np.einsum('ij,ij->i', delta, delta)
+    to_center = centers[np.newaxis, :, :] - starts[:, np.newaxis, :]
+    t = np.einsum('mnk,mk->mn', to_center, delta) / np.where(length2 > 0, length2, 1)[:, np.newaxis]
+    closest = starts[:, np.newaxis, :] + delta[:, np.newaxis, :] * np.clip(t, 0, 1)[..., np.newaxis]
+    offset = closest - centers[np.newaxis, :, :]
+    return np.hypot(offset[..., 0], offset[..., 1])
+
+
+def test_lookup_matches_exact_distance():
+    rng = np.random.default_rng(42)
+    points = rng.uniform((0, 0), C.SCREEN.size, size=(20000, 2))
+    # Crowd the rims, that's where it can go wrong
+    for center, radius, _ in EXPLOSIONS:
+        angle = rng.uniform(0, 2 * np.pi, 2000)
+        r = radius + rng.uniform(-2, 2, 2000)
+        points = np.vstack([points, np.column_stack([center[0] + r * np.cos(angle),
+                                                     center[1] + r * np.sin(angle)])])
+    points = points[(points >= C.SCREEN.topleft).all(axis=1) & (points < C.SCREEN.bottomright).all(axis=1)]
+
+    field = mk_field()
+    hit, evade = field.lookup(points)
+
+    d = distances(points)
+    radii = np.array([radius for _, radius, _ in EXPLOSIONS])
+    exact = (d <= radii).any(axis=1)
+    wrong = hit != exact
+    assert wrong.any(), 'no rim samples, the test proves nothing'
+    slack = np.abs(d - radii).min(axis=1)
+    assert (slack[wrong] <= RIM).all()
+
+    growing = np.array([g for _, _, g in EXPLOSIONS])
+    reach = (d < C.EXPLOSION_EVADE_RADIUS) & growing
+    newest = np.where(reach.any(axis=1), len(EXPLOSIONS) - 1 - reach[:, ::-1].argmax(axis=1), -1)
+    clear = (np.abs(d - C.EXPLOSION_EVADE_RADIUS)[:, growing] > RIM).all(axis=1)
+    assert (evade[clear] == newest[clear]).all()
+
+
+def test_sweep_matches_exact_distance():
+    rng = np.random.default_rng(23)
+    starts = rng.uniform((0, 0), C.SCREEN.size, size=(5000, 2))
+    # Everything from standing still to 3 frames of a fast smartbomb
+    ends = starts + rng.uniform(-12, 12, size=(5000, 2))
+    starts = np.clip(starts, (0, 0), np.array(C.SCREEN.size) - 1e-6)
+    ends = np.clip(ends, (0, 0), np.array(C.SCREEN.size) - 1e-6)
+
+    field = mk_field()
+    hit, _ = field.sweep(starts, ends)
+
+    d = segment_distances(starts, ends)
+    radii = np.array([radius for _, radius, _ in EXPLOSIONS])
+    exact = (d <= radii).any(axis=1)
+    assert exact.any() and not exact.all()
+
+    # Hits are never further out than a pixel center on the rim
+    assert (d[hit] <= radii + RIM).any(axis=1).all()
+    # and nothing that's a sample step inside the rim gets through
+    assert hit[(d <= radii - SWEEP_RIM).any(axis=1)].all()
+
+
+def test_sweep_does_not_tunnel():
+    # The sample step follows the longest segment, so give them all the same
+    # length and graze the rims, where a too coarse sampling tunnels through.
+    rng = np.random.default_rng(5)
+    starts, ends = [], []
+    for center, radius, _ in EXPLOSIONS:
+        angle = rng.uniform(0, 2 * np.pi, 1000)
+        normal = np.column_stack([np.cos(angle), np.sin(angle)])
+        along = np.column_stack([-normal[:, 1], normal[:, 0]]) * 12
+        mid = center + normal * (radius + rng.uniform(-2, 1, (1000, 1)))
+        starts.append(mid - along)
+        ends.append(mid + along)
+    starts, ends = np.vstack(starts), np.vstack(ends)
+    inside = (np.minimum(starts, ends) >= (0, 0)).all(axis=1) & (np.maximum(starts, ends) < C.SCREEN.size).all(axis=1)
+    starts, ends = starts[inside], ends[inside]
+
+    field = mk_field()
+    hit, _ = field.sweep(starts, ends)
+
+    d = segment_distances(starts, ends)
+    radii = np.array([radius for _, radius, _ in EXPLOSIONS])
+    assert (d[hit] <= radii + RIM).any(axis=1).all()
+    assert hit[(d <= radii - SWEEP_RIM).any(axis=1)].all()
+
+
+def test_outside_is_never_covered():
+    field = mk_field()
+    points = np.array([(-0.5, 230.0), (256.0, 230.0), (250.0, 240.0), (250.0, 239.9)])
+
+    hit, evade = field.lookup(points)
+
+    assert hit.tolist() == [False, False, False, True]
+    assert evade.tolist() == [-1, -1, -1, 4]
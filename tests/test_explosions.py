@@ -0,0 +1,62 @@
+import pytest
+
+from ddframework.dynamicsprite import PRSA
+from pgcooldown import LerpThing
+from pygame.math import Vector2 as vec2
+
+import missilecommand.config as C
+
+from missilecommand.explosions import ExplosionRegistry
+from missilecommand.headless import sim_clock
+
+
+def test_closed_form_matches_lerpthing():
+    registry = ExplosionRegistry(capacity=1)
+    registry.clear()
+
+    lerps = []
+    for i in range(3):
+        registry.add(f'explosion-{i}', PRSA(vec2(10 * i, 0)))
+        lerps.append(LerpThing(*C.EXPLOSION_SCALE_RANGE, C.EXPLOSION_DURATION, repeat=2, loops=2))
+        sim_clock.advance(0.25)
+    # The first explosion already lived for 0.75s, the last one for 0.25s
+    assert registry.eids == ['explosion-0', 'explosion-1', 'explosion-2']
+
+    steps = 0
+    while registry.size:
+        registry.update()
+        live = {f'explosion-{i}': lt for i, lt in enumerate(lerps) if not lt.finished()}
+        assert registry.eids == list(live)
+
+        _, radii, growing = registry.arrays()
+        for lt, radius, is_growing in zip(live.values(), radii.tolist(), growing.tolist()):
+            assert radius == pytest.approx(lt() * C.EXPLOSION_RADIUS, abs=1e-9)
+            # The same test the collisions did on the lerp before
+            assert is_growing == (lt.loops == 1)
+
+        sim_clock.advance(1 / 60)
+        steps += 1
+
+    assert all(lt.finished() for lt in lerps)
+    # The last explosion had a 0.25s head start on its 3s
+    assert steps == pytest.approx(2.75 * 60, abs=2)
+
+
+def test_finished_explosions_are_dropped():
+    registry = ExplosionRegistry()
+    registry.clear()
+
+    registry.add('old', PRSA(vec2(1, 2)))
+    sim_clock.advance(C.EXPLOSION_DURATION + 0.01)
+    registry.add('new', PRSA(vec2(3, 4)))
+
+    assert registry.update() == []
+    sim_clock.advance(C.EXPLOSION_DURATION + 0.01)
+
+    assert registry.update() == ['old']
+    assert registry.eids == ['new']
+    assert registry.center[0].tolist() == [3, 4]
+
+    sim_clock.advance(C.EXPLOSION_DURATION + 0.01)
+    assert registry.update() == ['new']
+    assert len(registry) == 0
@@ -0,0 +1,177 @@
+import random
+
+import pytest
+
+from pygame.math import Vector2 as vec2
+
+import missilecommand.config as C
+
+from missilecommand.impacts import GROUND, ImpactSchedule, first_contact
+
+TARGETS = [('city', i, hitbox) for i, hitbox in enumerate(C.HITBOX_CITY)]
+ALL_TARGETS = TARGETS + [('battery', i, hitbox) for i, hitbox in enumerate(C.HITBOX_BATTERIES)]
+MAX_SECONDS = 60
+
+
+def per_frame(start, dest, speed, dt, speed_up_at=None):
+    """The frame of the first ground contact the way the collisions found it
+    before, by moving the missile and checking the hitboxes every frame."""
+    pos = start.copy()
+    momentum = (dest - start).normalize() * speed
+    for frame in range(1, round(MAX_SECONDS / dt)):
+        if frame == speed_up_at:
+            momentum *= 3
+
+        # sys_momentum, sys_dont_overshoot
+        pos += momentum * dt
+        delta = dest - pos
+        if not delta or delta.length() < momentum.length() and momentum * delta < 0:
+            pos = dest
+
+        for kind, i, hitbox in GROUND:
+            if hitbox.collidepoint(pos):
+                return frame, kind, i
+
+    return None
+
+
+def scheduled(schedule, dt, speed_up_at=None):
+    """The frames the schedule reports its missiles due, by eid."""
+    due = {}
+    for frame in range(1, round(MAX_SECONDS / dt)):
+        if frame == speed_up_at:
+            schedule.speed_up(3)
+        schedule.advance(dt)
+        for kind in ('city', 'battery'):
+            for eid, i in schedule.take(kind):
+                assert eid not in due
+                due[eid] = (frame, kind, i)
+
+        if not schedule:
+            break
+
+    return due
+
+
+def launch(rng, targets, n, speeds):
+    missiles = []
+    for _ in range(n):
+        _, _, hitbox = rng.choice(targets)
+        start = vec2(rng.uniform(0, C.SCREEN.width), 0)
+        dest = vec2(rng.uniform(hitbox.left, hitbox.right), rng.uniform(hitbox.top, hitbox.bottom))
+        missiles.append((start, dest, rng.uniform(*speeds)))
+
+    return missiles
+
+
+@pytest.mark.parametrize('dt', [1 / 60, 1 / 30])
+@pytest.mark.parametrize('targets', [TARGETS, ALL_TARGETS], ids=['cities', 'cities+batteries'])
+def test_schedule_matches_per_frame_hitbox_test(dt, targets):
+    rng = random.Random(17)
+    # Slow enough to not step over a battery within a frame
+    missiles = launch(rng, targets, 200, (10, 100))
+
+    schedule = ImpactSchedule()
+    for eid, (start, dest, speed) in enumerate(missiles):
+        schedule.add(eid, start, dest, speed)
+
+    due = scheduled(schedule, dt)
+
+    assert len(schedule) == 0
+    for eid, (start, dest, speed) in enumerate(missiles):
+        assert due[eid] == per_frame(start, dest, speed, dt), eid
+
+
+@pytest.mark.parametrize('dt', [1 / 60, 1 / 30])
+def test_speed_up(dt):
+    rng = random.Random(4)
+    missiles = launch(rng, TARGETS, 100, (10, 40))
+    speed_up_at = 2 * C.FPS
+
+    schedule = ImpactSchedule()
+    for eid, (start, dest, speed) in enumerate(missiles):
+        schedule.add(eid, start, dest, speed)
+
+    due = scheduled(schedule, dt, speed_up_at)
+
+    assert any(frame > speed_up_at for frame, _, _ in due.values())
+    for eid, (start, dest, speed) in enumerate(missiles):
+        expected = per_frame(start, dest, speed, dt, speed_up_at)
+        if due[eid] != expected:
+            # 3 times as fast, a frame can step over the corner of a hitbox,
+            # the schedule still catches that one.
+            frame, kind, i = due[eid]
+            assert frame < expected[0], eid
+            fine = per_frame(start, dest, speed, dt / 64, speed_up_at and speed_up_at * 64)
+            assert fine[1:] == (kind, i), eid
+
+
+def test_cancel():
+    hitbox = C.HITBOX_CITY[2]
+    start, dest = vec2(hitbox.centerx, 0), vec2(hitbox.center)
+
+    schedule = ImpactSchedule()
+    schedule.add('shot-down', start, dest, 50)
+    schedule.add('reused', start, dest, 50)
+    schedule.cancel('shot-down')
+    schedule.cancel('never-added')
+    # The pool hands out the ID again, the old heap entry must not count
+    schedule.cancel('reused')
+    schedule.advance(0.5)
+    schedule.add('reused', start, dest, 100)
+
+    assert len(schedule) == 1
+    schedule.advance(10)
+    assert schedule.take('city') == [('reused', 2)]
+    assert schedule.take('city') == []
+    assert schedule.take('battery') == []
+    assert len(schedule) == 0
+
+
+def test_no_contact():
+    schedule = ImpactSchedule()
+    # Between a battery and a city, and standing still
+    schedule.add('miss', vec2(140, 0), vec2(140, C.SCREEN.bottom), 50)
+    schedule.add('parked', vec2(C.HITBOX_CITY[0].center), vec2(C.HITBOX_CITY[0].center), 50)
+
+    assert len(schedule) == 0
+    assert first_contact(vec2(140, 0), vec2(140, C.SCREEN.bottom)) is None
+
+
+@pytest.mark.parametrize('side, offset, frame_early', [
+    ('top', vec2(0, -1), 0),
+    ('left', vec2(-1, 0), 0),
+    ('bottom', vec2(0, 1), 1),
+    ('right', vec2(1, 0), 1),
+])
+def test_edges(side, offset, frame_early):
+    """The slab test includes all edges, `Rect.collidepoint` only top and left.
+
+    Landing exactly on a bottom or right edge, the schedule reports the
+    missile one frame before the hitbox test would have.
+    """
+    dt = 1 / 60
+    hitbox = C.HITBOX_CITY[3]
+    # 2 frames at 1 px per frame onto the edge, then on towards the center
+    if side in ('top', 'bottom'):
+        edge = vec2(hitbox.centerx, getattr(hitbox, side))
+    else:
+        edge = vec2(getattr(hitbox, side), hitbox.centery)
+    start = edge + offset * 2
+    dest = edge - offset * 4
+
+    schedule = ImpactSchedule()
+    schedule.add('edge', start, dest, 60)
+    due = scheduled(schedule, dt)
+
+    assert due['edge'] == (2, 'city', 3)
+    assert per_frame(start, dest, 60, dt) == (2 + frame_early, 'city', 3)
+
+
+def test_edges_parallel():
+    """Straight down on the right edge is outside, on the left one inside."""
+    hitbox = C.HITBOX_CITY[1]
+
+    assert first_contact(vec2(hitbox.right, 0), vec2(hitbox.right, C.SCREEN.bottom)) is None
+    assert first_contact(vec2(hitbox.left, 0), vec2(hitbox.left, C.SCREEN.bottom)) == (hitbox.top, 'city', 1)
+    assert per_frame(vec2(hitbox.right, 0), vec2(hitbox.right, C.SCREEN.bottom), 60, 1 / 60) is None
@@ -0,0 +1,103 @@
+import pytest
+import tinyecs as ecs
+
+from pygame.math import Vector2 as vec2
+
+import missilecommand.config as C
+
+from missilecommand.launchers import mk_missile, mk_smartbomb
+from missilecommand.motion import MotionStore, motion_store
+from missilecommand.systems import (non_ecs_sys_motion, non_ecs_sys_prune, sys_aim,
+                                    sys_dont_overshoot, sys_momentum, sys_smartbomb_evade)
+from missilecommand.types import Comp, Prop
+
+DT = 1 / 60
+
+
+def launch(store: bool) -> list:
+    C.MOTION_STORE = store
+    eids = []
+    for i in range(12):
+        start = vec2(20 * i, -5 * i)
+        dest = vec2(240 - 15 * i, 200 + i)
+        if i % 4 == 3:
+            eids.append(mk_smartbomb(start, dest, 25 + i, None))
+        else:
+            eids.append(mk_missile(start, dest, 40 + 3 * i, incoming=True))
+
+    return eids
+
+
+def per_entity(dt):
+    """The motion systems in the order of `Game.run_game_systems`."""
+    for eid, (prsa, momentum) in ecs.comps_of_archetype(Comp.PRSA, Comp.MOMENTUM):
+        sys_momentum(dt, eid, prsa, momentum)
+    for eid, (prsa, evade_fix) in ecs.comps_of_archetype(Comp.PRSA, Comp.EVADE_FIX):
+        sys_smartbomb_evade(dt, eid, prsa, evade_fix)
+    for eid, (prsa, target, momentum, speed) in ecs.comps_of_archetype(
+            Comp.PRSA, Comp.TARGET, Comp.MOMENTUM, Comp.SPEED, has_properties={Prop.IS_SMARTBOMB}):
+        sys_aim(dt, eid, prsa, target, momentum, speed)
+    for eid, (prsa, momentum, target) in ecs.comps_of_archetype(Comp.PRSA, Comp.MOMENTUM, Comp.TARGET):
+        sys_dont_overshoot(dt, eid, prsa, momentum, target)
+
+
+def simulate(store: bool, frames: int) -> list:
+    eids = launch(store)
+    trace = []
+    for frame in range(frames):
+        if frame == 30:
+            # Rows from the middle of the store, the last one moves in
+            ecs.set_property(eids[4], Prop.IS_DEAD)
+            ecs.set_property(eids[5], Prop.IS_DEAD)
+        if frame == 40:
+            ecs.add_component(eids[7], Comp.EVADE_FIX, vec2(-30, 10))
+
+        if store:
+            non_ecs_sys_motion(motion_store, DT)
+        else:
+            per_entity(DT)
+        non_ecs_sys_prune()
+
+        trace.append([(tuple(ecs.comp_of_eid(eid, Comp.PRSA).pos), ecs.has_property(eid, Prop.IS_DEAD))
+                      if ecs.has(eid) else None
+                      for eid in eids])
+
+    return trace
+
+
+def test_store_matches_per_entity_systems(world):
+    frames = 12 * C.FPS
+    expected = simulate(False, frames)
+
+    world()
+    got = simulate(True, frames)
+
+    for frame, (want, have) in enumerate(zip(expected, got)):
+        for i, (a, b) in enumerate(zip(want, have)):
+            assert (a is None) == (b is None), (frame, i)
+            if a is not None:
+                assert a[1] == b[1], (frame, i)
+                assert a[0] == pytest.approx(b[0], abs=1e-9), (frame, i)
+
+    # The missiles arrived and left the store, smartbombs circle their
+    # target until they hit the ground
+    assert all(entity is None for i, entity in enumerate(got[-1]) if i % 4 != 3)
+    assert len(motion_store) == 3
+
+
+def test_remove_swaps_last_row_in():
+    store = MotionStore(capacity=2)
+    prsas = {}
+    for i in range(5):
+        prsas[i] = type('P', (), {'pos': vec2(i, 0)})()
+        store.add(i, prsas[i], vec2(1, 0), vec2(100, 0), 1, aim=False)
+
+    store.remove(1)
+    store.remove(4)
+    store.remove(42)
+
+    assert store.size == 3
+    assert store.eids == [0, 3, 2]
+    assert store.rows == {0: 0, 3: 1, 2: 2}
+    assert store.pos[:3, 0].tolist() == [0, 3, 2]
+    assert all(store.prsas[row] is prsas[eid] for eid, row in store.rows.items())
@@ -0,0 +1,105 @@
+import tinyecs as ecs
+
+from pygame.math import Vector2 as vec2
+
+import missilecommand.config as C
+
+from missilecommand.headless import sim_clock
+from missilecommand.launchers import mk_explosion, mk_missile, mk_target
+from missilecommand.pool import EntityPool, entity_pool
+from missilecommand.types import Comp, Prop
+
+
+def retire(eid):
+    ecs.set_property(eid, Prop.IS_DEAD)
+    entity_pool.retire(eid)
+
+
+def test_missile_comes_back_clean(world):
+    eid = mk_missile(vec2(10, 0), vec2(100, 200), 50, incoming=True)
+    prsa, trail, target, momentum = ecs.comps_of_eid(eid, Comp.PRSA, Comp.TRAIL, Comp.TARGET, Comp.MOMENTUM)
+    prsa.pos = target  # what sys_dont_overshoot does on arrival
+    trail.head.update(100, 200)
+    ecs.set_property(eid, Prop.HAS_EVADED)
+    retire(eid)
+
+    again = mk_missile(vec2(30, 0), vec2(60, 220), 20, incoming=False)
+
+    assert again == eid
+    assert entity_pool.hits == 1
+    assert not ecs.has_property(again, Prop.IS_DEAD)
+    assert not ecs.has_property(again, Prop.HAS_EVADED)
+    assert not ecs.has_property(again, Prop.IS_INCOMING)
+    assert ecs.has_property(again, Prop.IS_DEFENSE)
+    assert not ecs.eid_has(again, Comp.SHUTDOWN)
+
+    prsa, trail, target, momentum, speed = ecs.comps_of_eid(again, Comp.PRSA, Comp.TRAIL, Comp.TARGET,
+                                                            Comp.MOMENTUM, Comp.SPEED)
+    assert prsa.pos == (30, 0)
+    assert prsa.pos is not target
+    assert trail.origin == (30, 0) and trail.head == (30, 0)
+    assert target == (60, 220)
+    assert momentum == (vec2(60, 220) - vec2(30, 0)).normalize() * 20
+    assert speed == 20
+
+
+def test_explosion_comes_back_clean(world):
+    eid = mk_explosion(vec2(50, 50))
+    scale = ecs.comp_of_eid(eid, Comp.SCALE)
+
+    # Run into the shrinking half, where the lerp has swapped its end points
+    sim_clock.advance(1.5 * C.EXPLOSION_DURATION)
+    assert scale() < C.EXPLOSION_SCALE_RANGE[1]
+    retire(eid)
+
+    again = mk_explosion(vec2(70, 80))
+
+    assert again == eid
+    assert not ecs.has_property(again, Prop.IS_DEAD)
+    prsa, scale = ecs.comps_of_eid(again, Comp.PRSA, Comp.SCALE)
+    assert prsa.pos == (70, 80)
+    assert prsa.scale == C.EXPLOSION_SCALE_RANGE[0]
+    assert (scale.vt0, scale.vt1) == C.EXPLOSION_SCALE_RANGE
+    assert scale() == C.EXPLOSION_SCALE_RANGE[0]
+
+    sim_clock.advance(C.EXPLOSION_DURATION / 2)
+    assert abs(scale() - sum(C.EXPLOSION_SCALE_RANGE) / 2) < 1e-9
+
+
+def test_target_comes_back_clean(world):
+    eid = mk_target(None, vec2(5, 5))
+    retire(eid)
+
+    again = mk_target(None, vec2(40, 60))
+
+    assert again == eid
+    assert not ecs.has_property(again, Prop.IS_DEAD)
+    assert ecs.comp_of_eid(again, Comp.PRSA).pos == (40, 60)
+
+
+def test_hit_and_miss_counts(world):
+    assert entity_pool.acquire(Prop.IS_MISSILE) is None
+    assert (entity_pool.hits, entity_pool.misses, entity_pool.hit_rate) == (0, 1, 0.0)
+
+    eids = [mk_missile(vec2(i, 0), vec2(i, 200), 50, incoming=False) for i in range(3)]
+    assert entity_pool.misses == 4
+    for eid in eids:
+        retire(eid)
+    assert entity_pool.size()[Prop.IS_MISSILE] == 3
+
+    for i in range(4):
+        mk_missile(vec2(i, 0), vec2(i, 200), 50, incoming=False)
+
+    assert (entity_pool.hits, entity_pool.misses) == (3, 5)
+    assert entity_pool.hit_rate == 3 / 8
+    assert entity_pool.size()[Prop.IS_MISSILE] == 0
+
+
+def test_capacity(world):
+    pool = EntityPool(capacity=1)
+    eids = [mk_target(None, vec2(i, i)) for i in range(2)]
+    for eid in eids:
+        pool.retire(eid)
+
+    assert pool.size()[Prop.IS_TARGET] == 1
+    assert not any(ecs.has(eid) for eid in eids)